@@ -14,6 +14,7 @@ LANGUAGES = {
         "status_indexing": "Indexing data into memory...",
         "status_db_ok": "Database updated successfully!",
         "status_done": "Success! {} cards processed.",
+        "status_error": "Processing failed. See the log for details.",
         
         "msg_empty": "Please enter at least one card name.",
         "msg_copy": "Data copied to clipboard!",
@@ -35,6 +36,7 @@ LANGUAGES = {
         "status_indexing": "Indexando datos en memoria...",
         "status_db_ok": "¡Base de datos actualizada!",
         "status_done": "¡Éxito! {} cartas procesadas.",
+        "status_error": "Error al procesar. Consulta el registro para más detalles.",
         
         "msg_empty": "Por favor, introduce al menos un nombre de carta.",
         "msg_copy": "¡Datos copiados al portapapeles!",
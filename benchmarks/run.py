@@ -0,0 +1,414 @@
+"""
+Reproducible benchmark suite for Buildeck's data layer.
+
+Runs every scenario against synthetic data (and a local Scryfall stand-in for
+the network paths), then reports wall time and peak Python memory. Results are
+written as JSON so runs from different commits can be compared:
+
+    python -m benchmarks.run --cards 30000 --output before.json
+    git checkout my-branch
+    python -m benchmarks.run --cards 30000 --output after.json --compare before.json
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.stub_server import ScryfallStub  # noqa: E402
+from benchmarks.synthetic import generate_oracle_cards, write_bulk_file  # noqa: E402
+from src.core.decklist import parse_decklist, write_csv  # noqa: E402
+from src.data.bulk_storage import BULK_FILE  # noqa: E402
+from src.data.cache_manager import CACHE_FILE, JOURNAL_SUFFIX, CacheManager  # noqa: E402
+from src.data.card_index import build_index_file  # noqa: E402
+from src.data.scryfall_repository import ScryfallRepository  # noqa: E402
+from src.data.worker_pool import CardResolverPool  # noqa: E402
+
+EXPORT_COLUMNS = ["Qty", "Name", "Mana", "Type", "Description", "P/T"]
+
+
+def measure(fn: Callable[[], Any], setup: Optional[Callable[[], None]] = None,
+            repeat: int = 5) -> dict[str, Any]:
+    """
+    Times `fn` `repeat` times (calling `setup` before each run, untimed), then
+    runs it once more under tracemalloc to record peak allocated memory.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": repeat,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+        "peak_mem_mb": round(peak / 1e6, 3),
+    }
+
+
+def worker_memory_mb() -> Optional[dict[str, float]]:
+    """
+    Memory of this process's live multiprocessing children (e.g. pool workers),
+    summed. Private memory is what each worker adds on its own; PSS also charges
+    shared pages (the memory-mapped card index, pages inherited through fork)
+    proportionally to the processes mapping them; RSS counts shared pages once
+    per worker. Linux only, via /proc; elsewhere falls back to the largest
+    finished child's peak RSS.
+    """
+    import multiprocessing
+
+    rss_kb = pss_kb = uss_kb = 0
+    try:
+        for child in multiprocessing.active_children():
+            with open(f"/proc/{child.pid}/smaps_rollup", encoding="ascii") as f:
+                for line in f:
+                    if line.startswith("Rss:"):
+                        rss_kb += int(line.split()[1])
+                    elif line.startswith("Pss:"):
+                        pss_kb += int(line.split()[1])
+                    elif line.startswith(("Private_Clean:", "Private_Dirty:")):
+                        uss_kb += int(line.split()[1])
+    except OSError:
+        try:
+            import resource
+        except ImportError:
+            return None
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return {"max_worker_rss_mb": round(peak / (1e6 if sys.platform == "darwin" else 1e3), 3)}
+    return {"workers_rss_mb": round(rss_kb / 1e3, 3), "workers_pss_mb": round(pss_kb / 1e3, 3),
+            "workers_uss_mb": round(uss_kb / 1e3, 3)}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def has_module(name: str) -> bool:
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+# --- Scenarios ---
+
+_STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from src.data.scryfall_repository import ScryfallRepository
+imported = time.perf_counter()
+repo = ScryfallRepository(api_root=sys.argv[2], data_dir=sys.argv[1])
+constructed = time.perf_counter()
+# Tick like a UI event loop would, recording the longest the main thread was held up
+stall, last = 0.0, constructed
+while not repo.wait_until_ready(0):
+    time.sleep(0.001)
+    now = time.perf_counter()
+    stall, last = max(stall, now - last), now
+ready = time.perf_counter()
+print(json.dumps({"import_s": imported - start, "construct_s": constructed - imported,
+                  "bulk_ready_s": ready - constructed, "main_thread_stall_s": stall,
+                  "cards": len(repo.bulk_index)}))
+"""
+
+
+def bench_startup(data_dir: str, api_root: str, repeat: int, rebuild_index: bool = False) -> dict[str, Any]:
+    """
+    Cold start of a fresh interpreter: import, construct, wait for the bulk index.
+    With `rebuild_index`, every run first deletes the card index (first launch
+    after a bulk download).
+    """
+    wall, phases = [], []
+    for _ in range(repeat):
+        if rebuild_index:
+            for path in glob.glob(os.path.join(data_dir, "*.idx")):
+                os.remove(path)
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT, data_dir, api_root],
+                             cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        wall.append(time.perf_counter() - start)
+        phases.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    result: dict[str, Any] = {
+        "runs": repeat,
+        "min_s": min(wall),
+        "median_s": statistics.median(wall),
+        "mean_s": statistics.fmean(wall),
+    }
+    for key in ("import_s", "construct_s", "bulk_ready_s", "main_thread_stall_s"):
+        result[key] = statistics.median(p[key] for p in phases)
+    return result
+
+
+def bench_async(stub: ScryfallStub, work_dir: str, deck_cards: list[dict[str, Any]],
+                repeat: int) -> dict[str, dict[str, Any]]:
+    """API resolution and image fan-out through the asyncio repository."""
+    from src.core.event_loop import EventLoopThread
+    from src.data.async_scryfall_repository import AsyncScryfallRepository
+
+    data_dir = os.path.join(work_dir, "async")
+    image_dir = os.path.join(data_dir, "images")
+    os.makedirs(image_dir)
+    names = [c["name"] for c in deck_cards]
+    image_urls = [(c.get("image_uris") or c["card_faces"][0]["image_uris"])["normal"] for c in deck_cards]
+
+    loop_thread = EventLoopThread().start()
+    repo = AsyncScryfallRepository(api_root=stub.url, data_dir=data_dir)
+    repo.repo.wait_until_ready()
+
+    def reset():
+        repo.repo.cache.data = {}
+
+    def resolve():
+        loop_thread.submit(repo.get_cards_data(names)).result()
+
+    async def fetch_images():
+        import asyncio
+        await asyncio.gather(*(repo.download_image(url, os.path.join(image_dir, f"{i}.jpg"))
+                               for i, url in enumerate(image_urls)))
+
+    try:
+        return {
+            "resolve_deck_async": measure(resolve, setup=reset, repeat=repeat),
+            "download_images_async": measure(
+                lambda: loop_thread.submit(fetch_images()).result(), repeat=repeat),
+        }
+    finally:
+        loop_thread.submit(repo.aclose()).result()
+        loop_thread.stop()
+
+
+def run_suite(args) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    work_dir = tempfile.mkdtemp(prefix="buildeck-bench-")
+    stub = ScryfallStub([], latency=args.latency, rate_limit_every=args.rate_limit_every)
+    stub.start()
+    try:
+        cards = generate_oracle_cards(args.cards, seed=args.seed, image_base=stub.url)
+        stub.load_cards(cards)
+        deck_cards = cards[:: max(1, len(cards) // args.deck_size)][:args.deck_size]
+        deck_lines = [f"4x {c['name']}" for c in deck_cards]
+
+        bulk_dir = os.path.join(work_dir, "bulk")
+        os.makedirs(bulk_dir)
+        bulk_bytes = write_bulk_file(os.path.join(bulk_dir, BULK_FILE), cards)
+        print(f"Generated {len(cards)} cards ({bulk_bytes / 1e6:.1f} MB compressed bulk file)")
+
+        def record(name: str, result: dict[str, Any]):
+            results[name] = result
+            extra = f", peak {result['peak_mem_mb']:.1f} MB" if "peak_mem_mb" in result else ""
+            if "workers_pss_mb" in result:
+                extra += (f", workers PSS {result['workers_pss_mb']:.1f} MB "
+                          f"(private {result['workers_uss_mb']:.1f} MB, RSS {result['workers_rss_mb']:.1f} MB)")
+            elif "max_worker_rss_mb" in result:
+                extra += f", largest worker RSS {result['max_worker_rss_mb']:.1f} MB"
+            print(f"  {name:<28} median {result['median_s'] * 1000:10.2f} ms{extra}")
+
+        # 1. Startup (separate interpreter, so imports are cold)
+        record("startup_index_build", bench_startup(bulk_dir, stub.url, args.repeat, rebuild_index=True))
+        record("startup", bench_startup(bulk_dir, stub.url, args.repeat))
+
+        # 2. Bulk indexing (opening the existing index; building it is step 6)
+        repo = ScryfallRepository(api_root=stub.url, data_dir=bulk_dir)
+        repo.wait_until_ready()
+        record("bulk_index", measure(repo._load_bulk_index, repeat=args.repeat))
+
+        # 3. Parsing every card (multi-face included)
+        record("parse_card_data", measure(
+            lambda: [repo._parse_card_data(c) for c in cards], repeat=args.repeat))
+
+        # 4. Cache writes
+        cache_dir = os.path.join(work_dir, "cache")
+        os.makedirs(cache_dir)
+        parsed = [repo._parse_card_data(c) for c in cards[:args.cache_saves]]
+        cache = CacheManager(data_dir=cache_dir)
+
+        def reset_cache():
+            cache.data = {}
+
+        def save_all():
+            for p in parsed:
+                cache.save_card(p["name"], "English", p)
+
+        record("cache_save", measure(save_all, setup=reset_cache, repeat=args.repeat))
+
+        # 5. Deck resolution from the bulk database (processing loop without the UI)
+        def reset_repo(r: ScryfallRepository):
+            def setup():
+                r.cache.data = {}
+            return setup
+
+        def resolve(r: ScryfallRepository, lang_name: str):
+            def run():
+                resolved = []
+                for info in parse_decklist(deck_lines).values():
+                    data = r.get_card_data(info["name"], lang_name=lang_name)
+                    if data:
+                        data["quantity"] = info["qty"]
+                        resolved.append(data)
+                return resolved
+            return run
+
+        record("resolve_deck_bulk", measure(
+            resolve(repo, "English"), setup=reset_repo(repo), repeat=args.repeat))
+        record("resolve_deck_warm", measure(resolve(repo, "English"), repeat=args.repeat))
+
+        # 6. Rebuilding the memory-mapped index (after a bulk download) and the process pool
+        index_path = os.path.join(work_dir, "index.idx")
+        record("mapped_index_build", measure(
+            lambda: build_index_file(os.path.join(bulk_dir, BULK_FILE), index_path), repeat=args.repeat))
+
+        pool_lines = [f"1 {c['name']}" for c in cards[:args.pool_cards]]
+        cache_file = os.path.join(bulk_dir, CACHE_FILE)
+
+        def clear_cache_file():
+            for path in (cache_file, cache_file + JOURNAL_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        # tracemalloc only sees the parent, so worker memory is sampled from the OS
+        # while the pool is still alive (highest value over all runs)
+        pool_memory: dict[int, dict[str, float]] = {}
+        for workers in sorted({1, args.workers}):
+            def run_pool(workers=workers):
+                with CardResolverPool(workers=workers, api_root=stub.url, data_dir=bulk_dir) as pool:
+                    pool.resolve_decklist(pool_lines)
+                    usage = worker_memory_mb() or {}
+                sample = pool_memory.setdefault(workers, {})
+                for key, value in usage.items():
+                    sample[key] = max(sample.get(key, 0.0), value)
+            result = measure(run_pool, setup=clear_cache_file, repeat=args.repeat)
+            result.update(pool_memory.get(workers, {}))
+            record(f"resolve_pool_{workers}w", result)
+        if len(pool_memory) > 1 and all("workers_pss_mb" in m for m in pool_memory.values()):
+            one, many = pool_memory[1], pool_memory[args.workers]
+            print(f"  worker memory {args.workers}w / 1w: "
+                  f"{many['workers_pss_mb'] / one['workers_pss_mb']:.2f}x PSS, "
+                  f"{many['workers_uss_mb'] / one['workers_uss_mb']:.2f}x private "
+                  f"(linear growth would be {args.workers}x)")
+
+        # 7. Export
+        export_rows = resolve(repo, "English")()
+        export_path = os.path.join(work_dir, "export.csv")
+        record("export_csv", measure(
+            lambda: write_csv(export_path, export_rows, EXPORT_COLUMNS), repeat=args.repeat))
+
+        # 8. Network paths against the local stand-in
+        if has_module("requests"):
+            api_dir = os.path.join(work_dir, "api")
+            os.makedirs(api_dir)
+            api_repo = ScryfallRepository(api_root=stub.url, data_dir=api_dir)
+            api_repo.wait_until_ready()
+            record("resolve_deck_api", measure(
+                resolve(api_repo, "English"), setup=reset_repo(api_repo), repeat=args.repeat))
+            record("resolve_deck_localized", measure(
+                resolve(api_repo, "Español"), setup=reset_repo(api_repo), repeat=args.repeat))
+            record("download_bulk", measure(
+                lambda: api_repo.download_bulk_data(lambda text, pct: None), repeat=args.repeat))
+            results["api_stats"] = api_repo.stats.snapshot()["lookups"]["tiers"]
+            results["stub"] = {"requests": stub.request_count,
+                               "rate_limited": stub.rate_limited_count}
+        else:
+            print("  (requests not installed: skipping network scenarios)")
+
+        if has_module("aiohttp"):
+            for name, result in bench_async(stub, work_dir, deck_cards, args.repeat).items():
+                record(name, result)
+        else:
+            print("  (aiohttp not installed: skipping async scenarios)")
+    finally:
+        stub.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]):
+    print(f"\nComparison against {baseline['meta'].get('commit') or 'baseline'}:")
+    print(f"  {'scenario':<28} {'before':>12} {'after':>12} {'change':>9} {'mem change':>11}")
+    for name, after in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before or "median_s" not in after or "median_s" not in before:
+            continue
+        change = (after["median_s"] - before["median_s"]) / before["median_s"] * 100
+        mem = ""
+        # Pool scenarios: worker memory matters, not the parent's
+        mem_key = "workers_pss_mb" if "workers_pss_mb" in after else "peak_mem_mb"
+        if mem_key in after and before.get(mem_key):
+            mem = f"{(after[mem_key] - before[mem_key]) / before[mem_key] * 100:+.1f}%"
+        print(f"  {name:<28} {before['median_s'] * 1000:9.2f} ms {after['median_s'] * 1000:9.2f} ms "
+              f"{change:+8.1f}% {mem:>11}")
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=30000, help="Synthetic bulk size (10k-100k is typical)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--deck-size", type=int, default=100, help="Unique cards per decklist")
+    parser.add_argument("--cache-saves", type=int, default=300, help="Cards written in the cache_save scenario")
+    parser.add_argument("--pool-cards", type=int, default=2000, help="Unique cards resolved by the process pool")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Process pool size")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per request (seconds)")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Stub answers 429 every N requests")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous JSON result")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("src").setLevel(logging.ERROR)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": run_suite(args),
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Local HTTP stand-in for the Scryfall API, used by the benchmark suite.
+
+Serves /cards/named, /cards/search, /cards/collection, /bulk-data, the bulk
+file itself and card images from an in-memory card list, with configurable
+per-request latency and periodic HTTP 429 responses. The bulk file is sent
+gzip-encoded to clients that accept it, like Scryfall's CDN.
+"""
+import gzip
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import bulk_json, localized_print
+
+# Minimal JPEG header/trailer around filler bytes; enough for byte-count benchmarks
+_JPEG_HEAD = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"
+_JPEG_TAIL = b"\xff\xd9"
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections is normal; anything else is reported
+        import sys
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class ScryfallStub:
+    """
+    Threaded HTTP server emulating the Scryfall endpoints Buildeck uses.
+
+    Args:
+        cards: Card objects to serve (e.g. from synthetic.generate_oracle_cards).
+        latency: Seconds to sleep before answering each request.
+        rate_limit_every: If > 0, every Nth request is answered with HTTP 429.
+        retry_after: Seconds sent in the Retry-After header of those 429 responses.
+        image_size: Size in bytes of the fake images served under /images/.
+        localized_langs: Languages for which /cards/search returns a translated print.
+    """
+
+    def __init__(self, cards: list[dict[str, Any]], latency: float = 0.0,
+                 rate_limit_every: int = 0, retry_after: float = 1.0, image_size: int = 60_000,
+                 localized_langs: tuple[str, ...] = ("es",),
+                 host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.localized_langs = localized_langs
+        self.image_bytes = _JPEG_HEAD + b"\x00" * max(0, image_size - 13) + _JPEG_TAIL
+        self.load_cards(cards)
+
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self._count_lock = threading.Lock()
+
+        self._server = _QuietServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    def load_cards(self, cards: list[dict[str, Any]]):
+        """Replaces the served cards (e.g. once `url` is known, to point image URIs here)."""
+        self.cards = cards
+        self.by_name = {c["name"].lower(): c for c in cards}
+        self.by_id = {c["id"]: c for c in cards}
+        self.by_oracle_id = {c["oracle_id"]: c for c in cards}
+        self._bulk_bytes: Optional[bytes] = None
+        self._bulk_gzip: Optional[bytes] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    @property
+    def bulk_bytes(self) -> bytes:
+        # Serialized lazily and once: the bulk endpoint is large
+        if self._bulk_bytes is None:
+            self._bulk_bytes = bulk_json(self.cards)
+        return self._bulk_bytes
+
+    @property
+    def bulk_gzip(self) -> bytes:
+        if self._bulk_gzip is None:
+            self._bulk_gzip = gzip.compress(self.bulk_bytes, compresslevel=6)
+        return self._bulk_gzip
+
+    def start(self) -> "ScryfallStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ScryfallStub":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _should_rate_limit(self) -> bool:
+        with self._count_lock:
+            self.request_count += 1
+            limited = self.rate_limit_every > 0 and self.request_count % self.rate_limit_every == 0
+            if limited:
+                self.rate_limited_count += 1
+            return limited
+
+    # --- Endpoint logic (returns status, body, content type) ---
+    def named(self, query: dict[str, list[str]]):
+        name = (query.get("exact") or query.get("fuzzy") or [""])[0].lower()
+        card = self.by_name.get(name)
+        if card is None:
+            return 404, _error(404, f"No card found named {name!r}"), "application/json"
+        return 200, card, "application/json"
+
+    def search(self, query: dict[str, list[str]]):
+        q = (query.get("q") or [""])[0]
+        oracle_id = re.search(r"oracleid:(\S+)", q)
+        lang = re.search(r"lang:(\S+)", q)
+        card = self.by_oracle_id.get(oracle_id.group(1)) if oracle_id else None
+        iso_lang = lang.group(1) if lang else "en"
+        if card is None or (iso_lang != "en" and iso_lang not in self.localized_langs):
+            return 404, _error(404, "Your query didn't match any cards."), "application/json"
+        printed = card if iso_lang == "en" else localized_print(card, iso_lang)
+        return 200, {"object": "list", "total_cards": 1, "has_more": False, "data": [printed]}, "application/json"
+
+    def collection(self, body: dict[str, Any]):
+        identifiers = body.get("identifiers", [])
+        if len(identifiers) > 75:
+            return 422, _error(422, "Too many identifiers (max 75)."), "application/json"
+        found: list[dict[str, Any]] = []
+        not_found: list[dict[str, Any]] = []
+        for ident in identifiers:
+            card = None
+            if "id" in ident:
+                card = self.by_id.get(ident["id"])
+            elif "name" in ident:
+                card = self.by_name.get(ident["name"].lower())
+            (found if card else not_found).append(card or ident)
+        return 200, {"object": "list", "not_found": not_found, "data": found}, "application/json"
+
+    def bulk_data(self):
+        return 200, {
+            "object": "list",
+            "data": [{
+                "object": "bulk_data",
+                "type": "oracle_cards",
+                "download_uri": f"{self.url}/bulk/oracle-cards.json",
+                "size": len(self.bulk_bytes),
+                "content_type": "application/json",
+            }],
+        }, "application/json"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+            def _send(self, status: int, body, content_type: str, headers: Optional[dict] = None):
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                # Large bodies are written in chunks, like a real streaming server
+                view = memoryview(payload)
+                for i in range(0, len(view), 1 << 16):
+                    self.wfile.write(view[i:i + (1 << 16)])
+
+            def _preamble(self) -> bool:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if stub._should_rate_limit():
+                    self._send(429, _error(429, "Too many requests"), "application/json",
+                               {"Retry-After": f"{stub.retry_after:g}"})
+                    return False
+                return True
+
+            def do_GET(self):
+                if not self._preamble():
+                    return
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path == "/cards/named":
+                    self._send(*stub.named(query))
+                elif url.path == "/cards/search":
+                    self._send(*stub.search(query))
+                elif url.path == "/bulk-data":
+                    self._send(*stub.bulk_data())
+                elif url.path == "/bulk/oracle-cards.json":
+                    if "gzip" in self.headers.get("Accept-Encoding", ""):
+                        self._send(200, stub.bulk_gzip, "application/json", {"Content-Encoding": "gzip"})
+                    else:
+                        self._send(200, stub.bulk_bytes, "application/json")
+                elif url.path.startswith("/images/"):
+                    self._send(200, stub.image_bytes, "image/jpeg")
+                else:
+                    self._send(404, _error(404, "Not found"), "application/json")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length) if length else b""
+                if not self._preamble():
+                    return
+                if urlparse(self.path).path != "/cards/collection":
+                    self._send(404, _error(404, "Not found"), "application/json")
+                    return
+                try:
+                    body = json.loads(raw or b"{}")
+                except json.JSONDecodeError:
+                    self._send(400, _error(400, "Invalid JSON"), "application/json")
+                    return
+                self._send(*stub.collection(body))
+
+        return Handler
+
+
+def _error(status: int, details: str) -> dict[str, Any]:
+    return {"object": "error", "status": status, "details": details}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from benchmarks.synthetic import generate_oracle_cards
+
+    parser = argparse.ArgumentParser(description="Run a local Scryfall stand-in server.")
+    parser.add_argument("--cards", type=int, default=10000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Send 429 every N requests")
+    args = parser.parse_args()
+
+    server = ScryfallStub([], latency=args.latency, rate_limit_every=args.rate_limit_every, port=args.port)
+    server.load_cards(generate_oracle_cards(args.cards, image_base=server.url))
+    print(f"Serving {args.cards} synthetic cards on {server.url} (Ctrl+C to stop)")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
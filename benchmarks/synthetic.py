@@ -0,0 +1,168 @@
+"""
+Synthetic Scryfall "Oracle Cards" generator for benchmarks.
+
+Produces deterministic card objects shaped like the real bulk file, including
+multi-face layouts (transform, modal_dfc, split), so the parsing and indexing
+code paths see realistic data without downloading anything.
+"""
+import gzip
+import json
+import random
+import uuid
+from typing import Any, Optional
+
+ADJECTIVES = [
+    "Ancient", "Blazing", "Cursed", "Dread", "Eternal", "Feral", "Gilded", "Hollow",
+    "Iron", "Jade", "Krosan", "Lunar", "Molten", "Nether", "Obsidian", "Primal",
+    "Quiet", "Radiant", "Savage", "Thundering", "Umbral", "Vengeful", "Wild", "Zealous",
+]
+NOUNS = [
+    "Angel", "Bolt", "Colossus", "Drake", "Elemental", "Familiar", "Golem", "Hydra",
+    "Inquisitor", "Juggernaut", "Knight", "Leviathan", "Mystic", "Nightmare", "Oracle",
+    "Phoenix", "Revenant", "Sphinx", "Titan", "Usurper", "Vampire", "Wurm", "Zombie",
+]
+TYPES = [
+    ("Creature", True), ("Instant", False), ("Sorcery", False),
+    ("Enchantment", False), ("Artifact", False), ("Artifact Creature", True),
+    ("Legendary Creature", True), ("Land", False), ("Planeswalker", False),
+]
+SUBTYPES = ["Human Wizard", "Dragon", "Elf Warrior", "Zombie", "Spirit", "Beast", "Goblin Shaman"]
+RULES = [
+    "Flying", "Trample", "Haste", "Vigilance, lifelink",
+    "When this enters, draw a card.",
+    "{T}: Add one mana of any color.",
+    "Deal 3 damage to any target.",
+    "Counter target spell unless its controller pays {2}.",
+    "At the beginning of your upkeep, each opponent loses 1 life.",
+    "Destroy target creature. It can't be regenerated.",
+]
+FORMATS = [
+    "standard", "future", "historic", "timeless", "gladiator", "pioneer", "explorer",
+    "modern", "legacy", "pauper", "vintage", "penny", "commander", "oathbreaker",
+    "standardbrawl", "brawl", "alchemy", "paupercommander", "duel", "oldschool", "premodern",
+]
+COLORS = ["W", "U", "B", "R", "G"]
+
+MULTI_FACE_LAYOUTS = ("transform", "modal_dfc", "split")
+
+
+def _mana_cost(rng: random.Random) -> str:
+    generic = rng.randint(0, 5)
+    colored = "".join(f"{{{rng.choice(COLORS)}}}" for _ in range(rng.randint(0, 3)))
+    return (f"{{{generic}}}" if generic or not colored else "") + colored
+
+
+def _image_uris(image_base: str, card_id: str, face: Optional[int] = None) -> dict[str, str]:
+    suffix = f"-{face}" if face is not None else ""
+    return {
+        size: f"{image_base}/images/{size}/{card_id}{suffix}.jpg?1700000000"
+        for size in ("small", "normal", "large", "png", "art_crop", "border_crop")
+    }
+
+
+def _face(rng: random.Random, name: str) -> dict[str, Any]:
+    type_name, is_creature = rng.choice(TYPES)
+    face: dict[str, Any] = {
+        "object": "card_face",
+        "name": name,
+        "mana_cost": _mana_cost(rng),
+        "type_line": f"{type_name} — {rng.choice(SUBTYPES)}" if is_creature else type_name,
+        "oracle_text": "\n".join(rng.sample(RULES, rng.randint(1, 3))),
+    }
+    if is_creature:
+        face["power"] = str(rng.randint(0, 8))
+        face["toughness"] = str(rng.randint(1, 8))
+    return face
+
+
+def generate_card(rng: random.Random, index: int, image_base: str,
+                  multi_face_ratio: float = 0.08) -> dict[str, Any]:
+    """Builds one card object shaped like a Scryfall Oracle card."""
+    card_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    oracle_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    base_name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {index}"
+
+    card: dict[str, Any] = {
+        "object": "card",
+        "id": card_id,
+        "oracle_id": oracle_id,
+        "lang": "en",
+        "released_at": f"20{rng.randint(10, 25):02d}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+        "uri": f"{image_base}/cards/{card_id}",
+        "layout": "normal",
+        "cmc": float(rng.randint(0, 8)),
+        "colors": sorted(rng.sample(COLORS, rng.randint(0, 2))),
+        "legalities": {fmt: rng.choice(["legal", "not_legal", "banned"]) for fmt in FORMATS},
+        "set": rng.choice(["lea", "mh3", "otj", "blb", "dsk", "fdn"]),
+        "rarity": rng.choice(["common", "uncommon", "rare", "mythic"]),
+        "prices": {"usd": f"{rng.random() * 20:.2f}", "eur": f"{rng.random() * 20:.2f}"},
+    }
+
+    if rng.random() < multi_face_ratio:
+        layout = rng.choice(MULTI_FACE_LAYOUTS)
+        back_name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {index}b"
+        faces = [_face(rng, base_name), _face(rng, back_name)]
+        card["layout"] = layout
+        card["name"] = f"{base_name} // {back_name}"
+        card["mana_cost"] = " // ".join(f["mana_cost"] for f in faces)
+        card["type_line"] = " // ".join(f["type_line"] for f in faces)
+        if layout == "split":
+            # Split cards share one image on the card object
+            card["image_uris"] = _image_uris(image_base, card_id)
+        else:
+            for i, f in enumerate(faces):
+                f["image_uris"] = _image_uris(image_base, card_id, i)
+        card["card_faces"] = faces
+    else:
+        face = _face(rng, base_name)
+        face.pop("object")
+        card.update(face)
+        card["image_uris"] = _image_uris(image_base, card_id)
+
+    return card
+
+
+def generate_oracle_cards(count: int, seed: int = 1234,
+                          image_base: str = "https://cards.scryfall.io",
+                          multi_face_ratio: float = 0.08) -> list[dict[str, Any]]:
+    """Generates `count` deterministic cards (same seed, same cards)."""
+    rng = random.Random(seed)
+    return [generate_card(rng, i, image_base, multi_face_ratio) for i in range(count)]
+
+
+def localized_print(card: dict[str, Any], iso_lang: str) -> dict[str, Any]:
+    """Returns a translated copy of `card` with printed_* fields, as /cards/search would."""
+    printed = dict(card)
+    printed["lang"] = iso_lang
+    printed["printed_name"] = f"{card['name']} [{iso_lang}]"
+    printed["printed_type_line"] = card.get("type_line")
+    printed["printed_text"] = card.get("oracle_text", "")
+    return printed
+
+
+def bulk_json(cards: list[dict[str, Any]]) -> bytes:
+    """Serializes cards the way Scryfall's bulk files are laid out: a JSON array, one card per line."""
+    lines = ",\n".join(json.dumps(card, ensure_ascii=False) for card in cards)
+    return f"[\n{lines}\n]\n".encode("utf-8")
+
+
+def write_bulk_file(path: str, cards: list[dict[str, Any]]) -> int:
+    """Writes cards as a bulk file, gzip-compressed if `path` ends in .gz. Returns the bytes written."""
+    data = bulk_json(cards)
+    if path.endswith(".gz"):
+        data = gzip.compress(data, compresslevel=6)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a synthetic Oracle Cards bulk file.")
+    parser.add_argument("output")
+    parser.add_argument("--cards", type=int, default=30000)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+    size = write_bulk_file(args.output, generate_oracle_cards(args.cards, args.seed))
+    print(f"Wrote {args.cards} cards ({size / 1e6:.1f} MB) to {args.output}")
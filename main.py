@@ -1,13 +1,83 @@
 # main.py
-from src.ui.main_window import MainWindow
-from src.data.scryfall_repository import ScryfallRepository
+import argparse
+import logging
+from contextlib import nullcontext
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="Buildeck")
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="Report import and initialization time per module once the window is shown."
+    )
+    parser.add_argument(
+        "--log-level", default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging verbosity (DEBUG traces every lookup)."
+    )
+    parser.add_argument(
+        "--stats-file", metavar="PATH",
+        help="Write lookup/image statistics as JSON to PATH on exit."
+    )
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="Resolve cards and images on a single asyncio event loop (requires aiohttp)."
+    )
+    # parse_known_args: macOS app bundles may pass extra arguments (e.g. -psn_*)
+    args, _ = parser.parse_known_args()
+    return args
+
+
+def run(profile_startup: bool = False, stats_file=None, use_async: bool = False):
+    profiler = None
+    if profile_startup:
+        from src.core.profiling import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.install()
+
+    def stage(name):
+        return profiler.stage(name) if profiler else nullcontext()
+
+    with stage("Import UI (customtkinter)"):
+        from src.ui.main_window import MainWindow
+    with stage("Import repository"):
+        from src.core.interfaces import AsyncCardRepository, CardRepository
+        from src.data.scryfall_repository import ScryfallRepository
 
-if __name__ == "__main__":
     # 1. Creamos el repositorio (la "lógica")
-    repo = ScryfallRepository()
-    
+    with stage("Create repository"):
+        repo = ScryfallRepository()
+        card_repo: CardRepository | AsyncCardRepository = repo
+        if use_async:
+            from src.data.async_scryfall_repository import AsyncScryfallRepository
+            card_repo = AsyncScryfallRepository(repo)
+
     # 2. Se lo pasamos a la ventana (la "vista")
-    app = MainWindow(repo)
-    
+    with stage("Create window"):
+        app = MainWindow(card_repo)
+
+    if profiler:
+        def report_first_frame():
+            profiler.mark("First frame (since launch)")
+            profiler.uninstall()
+            path = profiler.write_report()
+            print(profiler.report())
+            print(f"[PROFILE] Report written to {path}")
+        app.after(0, report_first_frame)
+
     # 3. Arrancamos
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+
+    if stats_file:
+        repo.stats.dump_json(stats_file)
+
+
+if __name__ == "__main__":
+    import sys
+    if getattr(sys, "frozen", False):
+        # Packaged builds: let spawned helper processes (index builder, worker pool) start
+        import multiprocessing
+        multiprocessing.freeze_support()
+    args = parse_args()
+    logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(name)s: %(message)s")
+    run(profile_startup=args.profile_startup, stats_file=args.stats_file, use_async=args.use_async)
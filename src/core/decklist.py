@@ -0,0 +1,59 @@
+"""
+Decklist parsing and export helpers, independent of the UI.
+"""
+import re
+from collections.abc import Sequence
+from typing import Any
+
+_LINE_PATTERN = re.compile(r"^(\d+)[xX]?\s+(.+)$")
+
+EXPORT_FIELDS = ["quantity", "name", "mana", "type", "desc", "pt"]
+
+
+def parse_decklist(lines: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Parses decklist lines ("4x Lightning Bolt", "Island (SET) 123", ...).
+
+    Returns:
+        A dict keyed by lowercase card name with {"qty": int, "name": str},
+        merging repeated entries and skipping "//" comment lines.
+    """
+    card_totals: dict[str, dict[str, Any]] = {}
+    for line in lines:
+        if line.startswith("//"): continue
+        match = _LINE_PATTERN.match(line)
+        if match:
+            qty = int(match.group(1))
+            name = match.group(2).strip()
+        else:
+            qty = 1
+            name = line.strip()
+        name = name.split("(")[0].strip()
+        key = name.lower()
+        if key in card_totals:
+            card_totals[key]["qty"] += qty
+        else:
+            card_totals[key] = {"qty": qty, "name": name}
+    return card_totals
+
+
+def to_clipboard_text(cards: list[dict[str, Any]], columns: list[str]) -> str:
+    """Formats cards as tab-separated text with a header row."""
+    header = "\t".join(columns)
+    body = "".join(
+        f"\n{d['quantity']}\t{d['name']}\t{d['mana']}\t{d['type']}\t{d['desc']}\t{d['pt']}"
+        for d in cards
+    )
+    return header + body
+
+
+def write_csv(path: str, cards: list[dict[str, Any]], columns: Sequence[str]):
+    """Writes cards to `path` as CSV, using `columns` as the localized header row."""
+    import csv  # Deferred: only needed on export
+
+    header_map = dict(zip(EXPORT_FIELDS, columns))
+    with open(path, mode="w", newline="", encoding="utf-8-sig") as f:
+        # Cards carry extra keys (e.g. image_url) that are not exported
+        writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        writer.writerow(header_map)
+        writer.writerows(cards)
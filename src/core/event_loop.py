@@ -0,0 +1,43 @@
+"""
+A single background thread running an asyncio event loop.
+
+Lets synchronous code (the Tk main loop) hand coroutines to one shared loop
+instead of spawning a thread per task.
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+
+class EventLoopThread:
+    """
+    Usage:
+        loop_thread = EventLoopThread().start()
+        future = loop_thread.submit(repo.get_card_data("Island"))
+        future.add_done_callback(...)   # runs on the loop thread
+        loop_thread.stop()
+    """
+
+    def __init__(self, name: str = "buildeck-asyncio"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self) -> "EventLoopThread":
+        self._thread.start()
+        return self
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Schedules `coro` on the loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout: Optional[float] = 5):
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self.loop.is_running():
+            self.loop.close()
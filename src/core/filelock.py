@@ -0,0 +1,76 @@
+"""
+Cross-process file lock and atomic file replacement helpers.
+"""
+import os
+import sys
+import tempfile
+from typing import Optional
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Exclusive advisory lock on `<path>.lock`, held across processes.
+
+    Usage:
+        with FileLock(cache_file):
+            ...  # read-modify-write cache_file
+    """
+
+    def __init__(self, path: str):
+        self.lock_path = f"{path}.lock"
+        self._fd: Optional[int] = None
+
+    def acquire(self):
+        self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        if sys.platform == "win32":
+            # msvcrt.locking retries for ~10s with LK_LOCK; loop until it succeeds
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if sys.platform == "win32":
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def atomic_write(path: str, data: bytes):
+    """
+    Writes `data` to a temporary file next to `path` and renames it into place,
+    so readers (in any process) see either the old or the new file, never a partial one.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
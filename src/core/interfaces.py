@@ -18,4 +18,31 @@ class CardRepository(ABC):
         Returns:
             A dictionary with card data if found, None otherwise.
         """
-        pass
\ No newline at end of file
+        pass
+
+class AsyncCardRepository(ABC):
+    """
+    Asynchronous counterpart of CardRepository, for use on an asyncio event loop.
+    """
+
+    @abstractmethod
+    async def get_card_data(self, name: str, lang_name: str = "English") -> Optional[dict[str, Any]]:
+        """
+        Retrieves data for a specific card without blocking the event loop.
+
+        Args:
+            name: The name of the card.
+            lang_name: The desired language (default: "English").
+
+        Returns:
+            A dictionary with card data if found, None otherwise.
+        """
+        pass
+
+    async def get_cards_data(self, names: list[str], lang_name: str = "English") -> list[Optional[dict[str, Any]]]:
+        """
+        Retrieves several cards concurrently. Results keep the order of `names`.
+        """
+        import asyncio
+
+        return list(await asyncio.gather(*(self.get_card_data(n, lang_name) for n in names)))
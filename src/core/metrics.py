@@ -0,0 +1,167 @@
+"""
+Lightweight instrumentation for card lookups and image downloads.
+
+`LookupStats` keeps thread-safe counters and latency histograms per
+resolution tier so callers can ask "where did my lookups come from and
+how long did they take?" without parsing logs.
+"""
+import bisect
+import json
+import threading
+from typing import Any, Optional
+
+# Order matches the resolution order in ScryfallRepository.get_card_data.
+# "cache" is CacheManager (loaded into RAM at startup, persisted on disk).
+TIERS = ("cache", "bulk_db", "api", "localized_api")
+
+# Upper bounds (in milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.5, 1, 5, 10, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram. Not thread-safe on its own; `LookupStats` guards it."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Approximates a percentile as the upper bound of the bucket that contains it."""
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        buckets = {f"<={b}ms": n for b, n in zip(LATENCY_BUCKETS_MS, self.counts)}
+        buckets[f">{LATENCY_BUCKETS_MS[-1]}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "min_ms": round(self.min_ms, 3) if self.min_ms is not None else None,
+            "max_ms": round(self.max_ms, 3) if self.max_ms is not None else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "buckets": buckets,
+        }
+
+
+class LookupStats:
+    """
+    Thread-safe counters for card resolution and image caching.
+
+    Tiers: see `TIERS`. A lookup that no tier could answer counts as a miss.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = {tier: 0 for tier in TIERS}
+            self.errors = {tier: 0 for tier in TIERS}
+            self.latency = {tier: LatencyHistogram() for tier in TIERS}
+            self.misses = 0
+            self.miss_latency = LatencyHistogram()
+            self.image_ram_hits = 0
+            self.image_disk_hits = 0
+            self.image_downloads = 0
+            self.image_bytes = 0
+            self.bulk_bytes = 0
+
+    # --- Recording ---
+    def record_hit(self, tier: str, seconds: float):
+        with self._lock:
+            self.hits[tier] += 1
+            self.latency[tier].observe(seconds)
+
+    def record_miss(self, seconds: float):
+        with self._lock:
+            self.misses += 1
+            self.miss_latency.observe(seconds)
+
+    def record_error(self, tier: str):
+        with self._lock:
+            self.errors[tier] += 1
+
+    def record_image_hit(self, source: str):
+        """`source` is either "ram" or "disk"."""
+        with self._lock:
+            if source == "ram":
+                self.image_ram_hits += 1
+            else:
+                self.image_disk_hits += 1
+
+    def record_image_download(self, nbytes: int):
+        with self._lock:
+            self.image_downloads += 1
+            self.image_bytes += nbytes
+
+    def record_bulk_bytes(self, nbytes: int):
+        with self._lock:
+            self.bulk_bytes += nbytes
+
+    # --- Querying ---
+    @property
+    def total_lookups(self) -> int:
+        return sum(self.hits.values()) + self.misses
+
+    def hit_ratio(self, tier: str) -> float:
+        total = self.total_lookups
+        return self.hits[tier] / total if total else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns a JSON-serializable copy of every counter."""
+        with self._lock:
+            total = sum(self.hits.values()) + self.misses
+            image_total = self.image_ram_hits + self.image_disk_hits + self.image_downloads
+            return {
+                "lookups": {
+                    "total": total,
+                    "misses": self.misses,
+                    "miss_latency": self.miss_latency.to_dict(),
+                    "tiers": {
+                        tier: {
+                            "hits": self.hits[tier],
+                            "hit_ratio": round(self.hits[tier] / total, 4) if total else 0.0,
+                            "errors": self.errors[tier],
+                            "latency": self.latency[tier].to_dict(),
+                        }
+                        for tier in TIERS
+                    },
+                },
+                "images": {
+                    "ram_hits": self.image_ram_hits,
+                    "disk_hits": self.image_disk_hits,
+                    "downloads": self.image_downloads,
+                    "cache_hit_ratio": round(
+                        (self.image_ram_hits + self.image_disk_hits) / image_total, 4
+                    ) if image_total else 0.0,
+                    "bytes_downloaded": self.image_bytes,
+                },
+                "bulk_bytes_downloaded": self.bulk_bytes,
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def dump_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
@@ -0,0 +1,130 @@
+"""
+Startup profiler used by `main.py --profile-startup`.
+
+Records how long every module takes to import (cumulative and self time)
+and how long each initialization stage of the application takes.
+"""
+import importlib.abc
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from src.core.paths import get_user_data_dir
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a real loader and times `exec_module` for the profiler."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._begin_import()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._end_import(module.__name__, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        # Resource readers, get_source, etc. are served by the real loader.
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path hook that delegates to the other finders and wraps their loaders."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Collects per-module import times and per-stage initialization times.
+
+    Usage:
+        profiler = StartupProfiler()
+        profiler.install()
+        with profiler.stage("Window"):
+            ...
+        print(profiler.report())
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._finder = _TimingFinder(self)
+        # Stack of accumulated child time for imports currently executing
+        self._child_time: list[float] = []
+        # module name -> (cumulative seconds, self seconds)
+        self.imports: dict[str, tuple[float, float]] = {}
+        # (stage name, seconds, modules imported during the stage)
+        self.stages: list[tuple[str, float, int]] = []
+
+    def install(self):
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def _begin_import(self):
+        self._child_time.append(0.0)
+
+    def _end_import(self, name: str, elapsed: float):
+        children = self._child_time.pop()
+        self.imports[name] = (elapsed, elapsed - children)
+        if self._child_time:
+            self._child_time[-1] += elapsed
+
+    @contextmanager
+    def stage(self, name: str):
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages.append((name, elapsed, len(sys.modules) - modules_before))
+
+    def mark(self, name: str):
+        """Records a point in time relative to profiler creation (e.g. first frame)."""
+        self.stages.append((name, time.perf_counter() - self._origin, 0))
+
+    def report(self, limit: int = 30) -> str:
+        lines = ["=== Buildeck startup profile ===", "", "Stages:"]
+        for name, elapsed, new_modules in self.stages:
+            lines.append(f"  {name:<32} {elapsed * 1000:9.1f} ms  (+{new_modules} modules)")
+
+        lines += ["", f"Imports (top {limit} by cumulative time, {len(self.imports)} total):"]
+        lines.append(f"  {'module':<48} {'cumulative':>12} {'self':>10}")
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (cumulative, own) in ranked[:limit]:
+            lines.append(f"  {name:<48} {cumulative * 1000:9.1f} ms {own * 1000:7.1f} ms")
+        return "\n".join(lines)
+
+    def write_report(self, path: Optional[str] = None) -> str:
+        """Writes the report next to the user data (stdout is hidden in windowed builds)."""
+        if path is None:
+            path = os.path.join(get_user_data_dir(), "startup_profile.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.report() + "\n")
+        return path
@@ -0,0 +1,248 @@
+"""
+This module provides an asyncio implementation of the Scryfall repository.
+
+Offline tiers (card cache, bulk database) are shared with a
+ScryfallRepository; network tiers use aiohttp so thousands of lookups and
+image downloads can be in flight on one event loop without a thread each.
+"""
+import asyncio
+import logging
+import time
+
+from typing import Optional, Any, Callable
+from src.core.interfaces import AsyncCardRepository
+from src.data.bulk_storage import BulkWriter
+from src.data.scryfall_repository import ScryfallRepository, parse_card_data
+
+logger = logging.getLogger(__name__)
+
+# Retries for HTTP 429 (Scryfall rate limit), honouring Retry-After
+MAX_RETRIES = 2
+# Seconds to coalesce cache writes before flushing them in one go
+FLUSH_DELAY = 0.5
+
+
+def _write_file(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+class AsyncScryfallRepository(AsyncCardRepository):
+    """
+    Implementation of AsyncCardRepository using the Scryfall API over aiohttp.
+
+    Must be used from a single event loop (see src/core/event_loop.py). Call
+    `aclose()` before the loop stops to flush the cache and close connections.
+    """
+
+    def __init__(self, repo: Optional[ScryfallRepository] = None, max_concurrency: int = 8, **repo_kwargs):
+        """
+        Args:
+            repo: Repository providing the offline tiers; created from `repo_kwargs` if omitted.
+            max_concurrency: Maximum simultaneous requests to Scryfall.
+        """
+        self.repo = repo or ScryfallRepository(**repo_kwargs)
+        self.stats = self.repo.stats
+        self.max_concurrency = max_concurrency
+
+        self._session = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # In-flight network lookups, so concurrent requests for one card share a fetch
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+    def _get_session(self):
+        import aiohttp  # Deferred: first network miss pays the import cost
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            )
+        return self._session
+
+    async def aclose(self):
+        """Writes pending cache entries and closes the HTTP session."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        await asyncio.to_thread(self.repo.cache.flush)
+        if self._session is not None:
+            await self._session.close()
+
+    # --- Cache writes ---
+    def _schedule_flush(self):
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        while self._dirty:
+            await asyncio.sleep(FLUSH_DELAY)
+            self._dirty = False
+            await asyncio.to_thread(self.repo.cache.flush)
+
+    # --- HTTP ---
+    async def _get_json(self, url: str, params: Optional[dict] = None) -> tuple[int, Optional[dict]]:
+        session = self._get_session()
+        async with self._semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                async with session.get(url, params=params) as response:
+                    if response.status == 429 and attempt < MAX_RETRIES:
+                        delay = float(response.headers.get("Retry-After", 1))
+                        logger.warning("Rate limited by Scryfall; retrying in %.1fs", delay)
+                        await asyncio.sleep(delay)
+                        continue
+                    if response.status == 200:
+                        return response.status, await response.json()
+                    return response.status, None
+        return 429, None
+
+    # --- Lookups ---
+    async def get_card_data(self, name: str, lang_name: str = "English") -> Optional[dict[str, Any]]:
+        logger.debug("Requesting: %s (%s)", name, lang_name)
+        iso_lang = self.repo.lang_codes.get(lang_name, "en")
+        start = time.perf_counter()
+
+        # 1-2. Card cache and bulk database (never blocks once the bulk index is loaded)
+        if iso_lang == "en" and not self.repo.wait_until_ready(0):
+            await asyncio.to_thread(self.repo.wait_until_ready)
+        offline_data = self.repo.lookup_offline(name, lang_name, start)
+        if offline_data is not None:
+            return offline_data
+
+        # 3. Fetch from Scryfall API, sharing any identical request already in flight
+        key = f"{name}_{lang_name}".lower()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fetch(name, lang_name, iso_lang, start))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, name: str, lang_name: str, iso_lang: str, start: float) -> Optional[dict[str, Any]]:
+        import aiohttp
+
+        tier = "api" if iso_lang == "en" else "localized_api"
+        try:
+            logger.debug("Fetching from API: %s...", name)
+            status, card_json = await self._get_json(self.repo.base_url, {'exact': name})
+
+            if status == 200 and card_json:
+                if iso_lang != "en":
+                    final_data = await self._get_localized_version(card_json, iso_lang)
+                else:
+                    final_data = parse_card_data(card_json)
+
+                self.repo.remember(name, lang_name, final_data, defer_save=True)
+                self._schedule_flush()
+                self.stats.record_hit(tier, time.perf_counter() - start)
+                return final_data
+
+            logger.warning("API Error %s for %s", status, name)
+            if status != 404:
+                self.stats.record_error(tier)
+
+        # ValueError: a 200 response whose body is not valid JSON
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning("Error connecting to Scryfall API: %s", e)
+            self.stats.record_error(tier)
+
+        self.stats.record_miss(time.perf_counter() - start)
+        return None
+
+    async def _get_localized_version(self, card_json: dict, iso_lang: str) -> dict:
+        import aiohttp
+
+        oracle_id = card_json.get("oracle_id")
+        if not oracle_id:
+            return parse_card_data(card_json)
+
+        query = f'oracleid:{oracle_id} lang:{iso_lang} unique:prints'
+        try:
+            status, data = await self._get_json(self.repo.search_url, {'q': query})
+            if status == 200 and data and data.get("total_cards", 0) > 0:
+                return parse_card_data(data["data"][0])
+            if status not in (200, 404):
+                self.stats.record_error("localized_api")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning("Localized search failed for %s: %s", oracle_id, e)
+            self.stats.record_error("localized_api")
+        return parse_card_data(card_json)
+
+    # --- Downloads ---
+    async def download_image(self, url: str, dest_path: str) -> bool:
+        """Downloads an image to `dest_path`. Returns False on HTTP or network errors."""
+        import aiohttp
+
+        session = self._get_session()
+        try:
+            async with self._semaphore:
+                async with session.get(url) as response:
+                    if response.status != 200:
+                        logger.warning("Image HTTP %s for %s", response.status, url)
+                        return False
+                    content = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Image download failed for %s: %s", url, e)
+            return False
+
+        # Disk I/O stays off the loop so other lookups keep flowing
+        await asyncio.to_thread(_write_file, dest_path, content)
+        self.stats.record_image_download(len(content))
+        return True
+
+    async def download_bulk_data(self, progress_callback: Callable[[str, float], None]):
+        """
+        Downloads the 'Oracle Cards' bulk file from Scryfall, streaming it to disk.
+        The previous file stays in place until the download completes.
+        """
+        import aiohttp
+
+        try:
+            progress_callback("Fetching metadata...", 0.1)
+            _, meta_data = await self._get_json(self.repo.bulk_url)
+
+            download_uri = None
+            for item in (meta_data or {}).get("data", []):
+                if item["type"] == "oracle_cards":
+                    download_uri = item["download_uri"]
+                    break
+
+            if not download_uri:
+                progress_callback("Error: Bulk URI not found.", 0)
+                return
+
+            progress_callback("Downloading database...", 0.2)
+            # No total timeout: the file is large; only stalled reads fail
+            timeout = aiohttp.ClientTimeout(total=None, sock_read=60)
+            # Keep the gzip stream as-is: it is exactly what we store on disk
+            async with self._get_session().get(download_uri, timeout=timeout, auto_decompress=False,
+                                               headers={'Accept-Encoding': 'gzip'}) as r:
+                r.raise_for_status()
+                gzipped = r.headers.get('Content-Encoding', '').lower() == 'gzip'
+                total_length = r.content_length or 0
+                dl = 0
+
+                # Writes (and gzip compression, if the server sent plain JSON) run in a
+                # worker thread, one chunk at a time and in order, never on the loop
+                writer = await asyncio.to_thread(BulkWriter, self.repo.bulk_file, gzipped)
+                try:
+                    async for chunk in r.content.iter_chunked(1 << 16):
+                        dl += len(chunk)
+                        await asyncio.to_thread(writer.write, chunk)
+                        self.stats.record_bulk_bytes(len(chunk))
+                        if total_length:
+                            pct = 0.2 + (0.7 * (dl / total_length))
+                            progress_callback(f"Downloading... {int(pct*100)}%", pct)
+                except BaseException:
+                    await asyncio.to_thread(writer.abort)
+                    raise
+                await asyncio.to_thread(writer.close)
+
+            progress_callback("Indexing data...", 0.95)
+            await asyncio.to_thread(self.repo._load_bulk_index)
+            progress_callback("Database updated!", 1.0)
+
+        except Exception as e:
+            progress_callback(f"Error: {str(e)}", 0)
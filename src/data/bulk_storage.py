@@ -0,0 +1,105 @@
+"""
+Compressed on-disk storage for the Scryfall bulk database.
+
+The bulk file is kept gzip-compressed (Scryfall already serves it gzip-encoded,
+so the download is saved as-is): about a tenth of the disk space. It is only
+inflated to rebuild the card index (src/data/card_index.py), never at startup.
+"""
+import gzip
+import json
+import logging
+import os
+import shutil
+import zlib
+from typing import Any
+
+from src.core.filelock import FileLock
+
+logger = logging.getLogger(__name__)
+
+BULK_FILE = "scryfall_oracle_cards.json.gz"
+# Uncompressed file written by earlier versions; migrated on first load
+LEGACY_BULK_FILE = "scryfall_oracle_cards.json"
+
+# Only used when we have to compress ourselves (legacy files, servers without gzip)
+COMPRESS_LEVEL = 6
+
+
+def load_bulk_cards(path: str) -> list[dict[str, Any]]:
+    """
+    Reads every card from a bulk file, gzip or plain (detected by magic bytes).
+
+    The file is inflated and decoded in one call each, both in C; decoding it
+    line by line from Python was measurably slower.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:2] == b"\x1f\x8b":
+        inflater = zlib.decompressobj(wbits=31)
+        data = inflater.decompress(raw)
+        if inflater.unused_data:
+            # Several gzip members (e.g. a concatenated file); let gzip walk them
+            data = gzip.decompress(raw)
+        raw = data
+    return json.loads(raw)
+
+
+class BulkWriter:
+    """
+    File-like sink for a bulk download that always ends up gzip-compressed.
+
+    Args:
+        path: Final path; data goes to `<path>.part` and is renamed on close().
+        gzipped: True when the incoming bytes are already gzip (Content-Encoding: gzip).
+    """
+
+    def __init__(self, path: str, gzipped: bool):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self._raw = open(self.part_path, "wb")
+        self._sink = self._raw if gzipped else gzip.GzipFile(
+            fileobj=self._raw, mode="wb", compresslevel=COMPRESS_LEVEL)
+
+    def write(self, chunk: bytes):
+        self._sink.write(chunk)
+
+    def close(self):
+        if self._sink is not self._raw:
+            self._sink.close()
+        self._raw.close()
+        # The previous database stays usable until the new one is complete
+        os.replace(self.part_path, self.path)
+
+    def abort(self):
+        self._raw.close()
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+    def __enter__(self) -> "BulkWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def migrate_legacy_bulk(data_dir: str) -> bool:
+    """
+    Compresses an uncompressed bulk file left by an earlier version. Returns True if migrated.
+    Safe to call from several processes at once; the others wait until it is done.
+    """
+    legacy = os.path.join(data_dir, LEGACY_BULK_FILE)
+    target = os.path.join(data_dir, BULK_FILE)
+    if not os.path.exists(legacy):
+        return False
+    with FileLock(target):
+        # Someone else may have migrated it while we waited
+        if not os.path.exists(legacy) or os.path.exists(target):
+            return False
+        logger.info("Compressing legacy bulk database %s...", legacy)
+        with open(legacy, "rb") as src, BulkWriter(target, gzipped=False) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.remove(legacy)
+    return True
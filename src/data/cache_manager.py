@@ -1,42 +1,214 @@
 import json
+import logging
 import os
-from datetime import datetime, timedelta
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from src.core.filelock import FileLock, atomic_write
 from src.core.paths import get_user_data_dir
 
+logger = logging.getLogger(__name__)
+
+# Snapshot: MAGIC + zlib-compressed compact JSON, timestamps as epoch seconds
+CACHE_FILE = "cache_cards.bin"
+MAGIC = b"BDC1"
+# New entries are appended to `<cache file>.journal` (one frame per flush)
+# and folded into the snapshot once the journal outgrows it, or when the
+# cache is next opened, so a flush costs O(new entries) instead of rewriting
+# the whole cache.
+# Frame: JOURNAL_MAGIC + length u32 + zlib-compressed compact JSON
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_MAGIC = b"BDJ1"
+_FRAME_HEADER = struct.Struct("<4sI")
+JOURNAL_COMPACT_MIN = 64 * 1024
+JOURNAL_COMPACT_RATIO = 1
+# Preset dictionary for journal frames: a flush often holds a single card, too
+# little text for zlib to find repeats in, but keys and common words recur.
+# Changing it makes existing journals unreadable; bump JOURNAL_MAGIC if you do.
+JOURNAL_ZDICT = (
+    'target creature you control. Draw a card. When this enters the battlefield, '
+    '"type":"Legendary Creature \u2014 Human Wizard","type":"Instant","type":"Sorcery",'
+    '"type":"Artifact","type":"Enchantment","type":"Land","desc":"Flying\\n",'
+    '"pt":"N/A","image_url":"https://cards.scryfall.io/normal/front/",'
+    '"mana":"{1}{W}{U}{B}{R}{G}","_english":{"timestamp":1700000000.0,"payload":{"name":"'
+).encode('utf-8')
+# Pretty-printed JSON with ISO timestamps written by earlier versions
+LEGACY_CACHE_FILE = "cache_cards.json"
+# Fast level: compaction runs while other processes wait on the lock
+COMPRESS_LEVEL = 1
+CACHE_TTL = 24 * 60 * 60
+
 class CacheManager:
-    def __init__(self, cache_file="cache_cards.json"):
-        # Use the system's secure data directory
-        self.data_dir = get_user_data_dir()
+    def __init__(self, cache_file=CACHE_FILE, data_dir=None):
+        """
+        Args:
+            cache_file: File name inside `data_dir`.
+            data_dir: Storage directory (default: get_user_data_dir()).
+
+        Several processes (the GUI, batch workers) may use the same cache at
+        once: every write happens under a file lock and only appends, so no
+        process can overwrite another's entries. Entries written by others
+        are picked up at the next compaction, not on every miss.
+        """
+        # Use the system's secure data directory unless told otherwise
+        self.data_dir = data_dir or get_user_data_dir()
         self.cache_file = os.path.join(self.data_dir, cache_file)
-        self.data = self._load_cache()
+        self.journal_file = self.cache_file + JOURNAL_SUFFIX
+        self._lock = FileLock(self.cache_file)
+        # Entries saved but not yet written, and nesting depth of batch()
+        self._pending = {}
+        self._batch_depth = 0
+        # Flushes may come from several threads; serialize them
+        self._flush_lock = threading.Lock()
+        with self._lock:
+            self._migrate_legacy()
+            self.data = {}
+            if os.path.exists(self.journal_file) and os.path.getsize(self.journal_file):
+                # Start each session with an empty journal
+                try:
+                    self._compact()
+                except OSError as e:
+                    logger.warning("Could not compact cache journal: %s", e)
+                    self.data = self._load_cache()
+            else:
+                self.data = self._load_cache()
+
+    def _migrate_legacy(self):
+        """Converts the JSON cache of earlier versions, then removes it."""
+        legacy = os.path.join(self.data_dir, LEGACY_CACHE_FILE)
+        if os.path.exists(self.cache_file) or not os.path.exists(legacy):
+            return
+        try:
+            with open(legacy, 'r', encoding='utf-8') as f:
+                old = json.load(f)
+            data = {
+                key: {'timestamp': datetime.fromisoformat(item['timestamp']).timestamp(),
+                      'payload': item['payload']}
+                for key, item in old.items()
+            }
+            self._write(data)
+            os.remove(legacy)
+            logger.info("Migrated %d cached cards from %s", len(data), legacy)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Could not migrate legacy cache %s: %s", legacy, e)
+
+    def _read_snapshot(self):
+        try:
+            with open(self.cache_file, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return {}
+        try:
+            if not raw.startswith(MAGIC):
+                raise ValueError("bad header")
+            return json.loads(zlib.decompress(raw[len(MAGIC):]))
+        except (ValueError, zlib.error):
+            logger.warning("Cache file %s is corrupt; starting empty.", self.cache_file)
+            return {}
+
+    def _read_journal(self):
+        entries = {}
+        try:
+            with open(self.journal_file, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return entries
+        pos = raw.find(JOURNAL_MAGIC)
+        while pos >= 0:
+            start = pos + _FRAME_HEADER.size
+            try:
+                _, length = _FRAME_HEADER.unpack_from(raw, pos)
+                if start + length > len(raw):
+                    raise ValueError("truncated frame")
+                inflater = zlib.decompressobj(zdict=JOURNAL_ZDICT)
+                entries.update(json.loads(inflater.decompress(raw[start:start + length])))
+                pos = raw.find(JOURNAL_MAGIC, start + length)
+            except (struct.error, ValueError, TypeError, zlib.error):
+                # Frame torn by a crashed writer: resume at the next marker
+                pos = raw.find(JOURNAL_MAGIC, pos + 1)
+        return entries
 
     def _load_cache(self):
-        if os.path.exists(self.cache_file):
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return {}
-        return {}
+        """Snapshot plus journal, as currently on disk. Call with the lock held."""
+        data = self._read_snapshot()
+        data.update(self._read_journal())
+        return data
+
+    def _write(self, data):
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        content = MAGIC + zlib.compress(text.encode('utf-8'), COMPRESS_LEVEL)
+        # Atomic replace: concurrent readers never see a half-written file
+        atomic_write(self.cache_file, content)
+
+    def _append_journal(self, entries):
+        """Appends one journal frame. Call with the lock held. Returns the journal size."""
+        text = json.dumps(entries, ensure_ascii=False, separators=(',', ':'))
+        deflater = zlib.compressobj(COMPRESS_LEVEL, zdict=JOURNAL_ZDICT)
+        body = deflater.compress(text.encode('utf-8')) + deflater.flush()
+        frame = _FRAME_HEADER.pack(JOURNAL_MAGIC, len(body)) + body
+        with open(self.journal_file, 'ab') as f:
+            f.write(frame)
+            return f.tell()
+
+    def _compact(self):
+        """Folds the journal into a new snapshot, dropping expired entries. Call with the lock held."""
+        now = time.time()
+        data = {key: item for key, item in self._load_cache().items()
+                if now - item.get('timestamp', 0) < CACHE_TTL}
+        self._write(data)
+        # A crash between the two steps only replays entries already in the snapshot
+        open(self.journal_file, 'wb').close()
+        # Free refresh: entries other processes wrote since we loaded
+        for key, item in data.items():
+            self.data.setdefault(key, item)
 
     def get_card(self, name, lang):
         key = f"{name}_{lang}".lower()
         if key in self.data:
             cached_item = self.data[key]
             # Check if cache is older than 24 hours
-            timestamp = datetime.fromisoformat(cached_item['timestamp'])
-            if datetime.now() - timestamp < timedelta(hours=24):
+            if time.time() - cached_item['timestamp'] < CACHE_TTL:
                 return cached_item['payload']
         return None
 
-    def save_card(self, name, lang, payload):
+    def save_card(self, name, lang, payload, defer=False):
+        """Stores a card. With `defer`, the write waits for the next flush()."""
         key = f"{name}_{lang}".lower()
-        self.data[key] = {
-            'timestamp': datetime.now().isoformat(),
+        entry = {
+            'timestamp': time.time(),
             'payload': payload
         }
+        self.data[key] = entry
+        self._pending[key] = entry
+        if self._batch_depth == 0 and not defer:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Defers writes until the block exits, then saves every new entry at once."""
+        self._batch_depth += 1
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"[CACHE ERROR] Could not save cache: {e}")
\ No newline at end of file
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            try:
+                with self._lock:
+                    journal_size = self._append_journal(pending)
+                    snapshot_size = os.path.getsize(self.cache_file) if os.path.exists(self.cache_file) else 0
+                    if journal_size > max(JOURNAL_COMPACT_MIN, JOURNAL_COMPACT_RATIO * snapshot_size):
+                        self._compact()
+            except Exception as e:
+                # Keep the entries so the next flush retries them (replaying a line twice is harmless)
+                self._pending = {**pending, **self._pending}
+                logger.error("Could not save cache: %s", e)
@@ -0,0 +1,195 @@
+"""
+Read-only, memory-mapped card index built from the bulk database.
+
+The bulk JSON (gzip or plain) is converted once into a binary file that any number of
+processes can mmap. Lookups binary-search a sorted hash table and decode a
+single card record, so the OS page cache holds one shared copy instead of
+every process keeping its own dict of ~30k cards.
+
+Each bulk file version gets its own index file (see `index_path_for`), so a
+rebuild never has to replace a file that live processes still have mapped
+(Windows refuses that).
+
+File layout (little endian):
+    header   : magic b"BDIX", version u32, count u32, table offset u64
+    records  : compact UTF-8 JSON of each card, back to back
+    table    : `count` entries of (name hash u64, record offset u64, record length u32),
+               sorted by hash
+"""
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Any, Iterator, Optional
+
+from src.core.filelock import FileLock, atomic_write
+from src.data.bulk_storage import load_bulk_cards
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BDIX"
+VERSION = 1
+_HEADER = struct.Struct("<4sIIQ")
+_ENTRY = struct.Struct("<QQI")
+
+
+def name_hash(name: str) -> int:
+    """Stable 64-bit hash of a lowercase card name (builtin hash() is per-process)."""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def build_index(cards: list[dict[str, Any]], index_file: str):
+    """Writes `cards` to `index_file` in the layout described in the module docstring."""
+    # Later duplicates win, matching the dict-based bulk index
+    unique = {card.get("name", "").lower(): card for card in cards}
+    records = bytearray()
+    entries = []
+    for name, card in unique.items():
+        blob = json.dumps(card, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        entries.append((name_hash(name), _HEADER.size + len(records), len(blob)))
+        records += blob
+    entries.sort()
+
+    table_offset = _HEADER.size + len(records)
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, len(entries), table_offset))
+    out += records
+    for entry in entries:
+        out += _ENTRY.pack(*entry)
+    atomic_write(index_file, bytes(out))
+
+
+def build_index_file(bulk_file: str, index_file: str):
+    """Builds `index_file` from the cards in `bulk_file`."""
+    build_index(load_bulk_cards(bulk_file), index_file)
+
+
+def _build_in_subprocess(bulk_file: str, index_file: str):
+    import multiprocessing  # Deferred: only needed when the index is (re)built
+
+    # spawn: a fresh interpreter that shares no GIL (or forked state) with the caller
+    process = multiprocessing.get_context("spawn").Process(
+        target=build_index_file, args=(bulk_file, index_file), name="buildeck-index", daemon=True)
+    try:
+        process.start()
+    except OSError as e:
+        logger.warning("Could not start index builder (%s); building in-process.", e)
+        build_index_file(bulk_file, index_file)
+        return
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"Building {index_file} failed (exit code {process.exitcode})")
+
+
+def index_path_for(bulk_file: str, index_file: str) -> str:
+    """`index_file` with the format version and the bulk file's mtime and size in its name."""
+    st = os.stat(bulk_file)
+    root, ext = os.path.splitext(index_file)
+    return f"{root}.v{VERSION}-{st.st_mtime_ns:x}-{st.st_size:x}{ext}"
+
+
+def _remove_stale_indexes(index_file: str, keep: str):
+    root, ext = os.path.splitext(index_file)
+    stale = glob.glob(glob.escape(root) + ".v*" + glob.escape(ext)) + [index_file]
+    for path in stale:
+        if path == keep or not os.path.exists(path):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            # Still mapped by a running process (Windows); removed on a later rebuild
+            logger.debug("Could not remove stale index %s", path)
+
+
+class MappedCardIndex(Mapping):
+    """
+    Mapping of lowercase card name -> raw Scryfall card dict, backed by mmap.
+
+    Supports `get`, `in` and `len` like a dict; each lookup decodes one record.
+    """
+
+    def __init__(self, index_file: str):
+        self.index_file = index_file
+        with open(index_file, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._table = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{index_file} is not a version {VERSION} card index")
+
+    @classmethod
+    def ensure(cls, bulk_file: str, index_file: str, isolated: bool = False) -> Optional["MappedCardIndex"]:
+        """
+        Opens the index of the current `bulk_file`, building it first if there is
+        none yet. `index_file` is the base name versions are derived from.
+        Returns None if there is no bulk file.
+        Safe to call from several processes at once; only one of them builds.
+
+        Args:
+            isolated: Build in a separate process. Decoding the bulk JSON is one
+                long C call that holds the GIL, which would freeze a UI thread.
+        """
+        if not os.path.exists(bulk_file):
+            return None
+        path = index_path_for(bulk_file, index_file)
+        if not os.path.exists(path):
+            with FileLock(index_file):
+                if not os.path.exists(path):
+                    logger.info("Building card index %s...", path)
+                    if isolated:
+                        _build_in_subprocess(bulk_file, path)
+                    else:
+                        build_index_file(bulk_file, path)
+                    _remove_stale_indexes(index_file, keep=path)
+        return cls(path)
+
+    def _entry(self, i: int) -> tuple[int, int, int]:
+        return _ENTRY.unpack_from(self._mm, self._table + i * _ENTRY.size)
+
+    def _record(self, offset: int, length: int) -> dict[str, Any]:
+        return json.loads(self._mm[offset:offset + length])
+
+    def __getitem__(self, name: str) -> dict[str, Any]:
+        key = name.lower()
+        target = name_hash(key)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        # Walk every entry sharing the hash (collisions are possible, if unlikely)
+        i = lo
+        while i < self._count:
+            h, offset, length = self._entry(i)
+            if h != target:
+                break
+            card = self._record(offset, length)
+            if card.get("name", "").lower() == key:
+                return card
+            i += 1
+        raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            _, offset, length = self._entry(i)
+            yield self._record(offset, length).get("name", "").lower()
+
+    def close(self):
+        self._mm.close()
@@ -1,56 +1,93 @@
 """
 This module provides a Scryfall API repository implementation for retrieving Magic: The Gathering card data.
 """
-import json
+import logging
 import os
-import requests
+import threading
+import time
 
+from collections.abc import Mapping
 from typing import Optional, Any, Callable
 from src.core.interfaces import CardRepository
+from src.core.metrics import LookupStats
+from src.data.bulk_storage import BULK_FILE, BulkWriter, migrate_legacy_bulk
 from src.data.cache_manager import CacheManager
+from src.data.card_index import MappedCardIndex
 from src.core.paths import get_user_data_dir
 
+logger = logging.getLogger(__name__)
+
 class ScryfallRepository(CardRepository):
     """
     Implementation of CardRepository using the Scryfall API.
     Includes local caching, bulk data loading, and multi-language support.
     """
     
-    def __init__(self):
-        self.base_url = "https://api.scryfall.com/cards/named"
-        self.search_url = "https://api.scryfall.com/cards/search"
-        self.bulk_url = "https://api.scryfall.com/bulk-data"
+    def __init__(self, api_root: str = "https://api.scryfall.com", data_dir: Optional[str] = None):
+        """
+        Args:
+            api_root: Base URL of the Scryfall API (overridable for local stand-ins).
+            data_dir: Storage directory (default: get_user_data_dir()).
+        """
+        self.base_url = f"{api_root}/cards/named"
+        self.search_url = f"{api_root}/cards/search"
+        self.bulk_url = f"{api_root}/bulk-data"
         
-        # Define secure path for the massive JSON file
-        self.data_dir = get_user_data_dir()
-        self.bulk_file = os.path.join(self.data_dir, "scryfall_oracle_cards.json")
+        # Define secure path for the massive JSON file (stored gzip-compressed)
+        self.data_dir = data_dir or get_user_data_dir()
+        self.bulk_file = os.path.join(self.data_dir, BULK_FILE)
+        self.index_file = os.path.join(self.data_dir, "scryfall_oracle_cards.idx")
         
-        self.cache = CacheManager()
+        self.cache = CacheManager(data_dir=self.data_dir)
         self.lang_codes = {"English": "en", "Español": "es"}
+
+        # Instrumentation: per-tier counters and latency histograms
+        self.stats = LookupStats()
         
-        # In-memory index for the bulk database
-        self.bulk_index = {}
-        self._load_bulk_index()
+        # Memory-mapped index of the bulk database, shared by every process.
+        # Opened in the background so the window can appear immediately;
+        # lookups wait on `_bulk_ready` before consulting it.
+        self.bulk_index: Mapping[str, dict[str, Any]] = {}
+        self._bulk_ready = threading.Event()
+        threading.Thread(target=self._load_bulk_index, daemon=True).start()
 
     def _load_bulk_index(self):
-        """Loads the massive JSON file into memory for instant lookups."""
-        if os.path.exists(self.bulk_file):
-            print(f"[SYSTEM] Loading bulk database from {self.bulk_file}...")
+        """
+        Opens the card index of the bulk file for instant lookups.
+        The bulk JSON is only decoded when the index has to be (re)built,
+        and then in a separate process.
+        """
+        try:
             try:
-                with open(self.bulk_file, 'r', encoding='utf-8') as f:
-                    cards = json.load(f)
-                    for card in cards:
-                        name = card.get("name", "").lower()
-                        self.bulk_index[name] = card
-                print(f"[SYSTEM] Bulk database loaded. {len(self.bulk_index)} cards ready.")
-            except Exception as e:
-                print(f"[ERROR] Failed to load bulk data: {e}")
+                migrate_legacy_bulk(self.data_dir)
+            except OSError as e:
+                logger.error("Could not compress legacy bulk data: %s", e)
+            if os.path.exists(self.bulk_file):
+                logger.info("Loading bulk database from %s...", self.bulk_file)
+                start = time.perf_counter()
+                try:
+                    index = MappedCardIndex.ensure(self.bulk_file, self.index_file, isolated=True)
+                    # Swap in one step so concurrent readers never see a partial index
+                    if index is not None:
+                        self.bulk_index = index
+                    logger.info("Bulk database loaded. %d cards ready in %.2fs.",
+                                len(self.bulk_index), time.perf_counter() - start)
+                except Exception as e:
+                    logger.error("Failed to load bulk data: %s", e)
+        finally:
+            self._bulk_ready.set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the background bulk load has finished (or timed out)."""
+        return self._bulk_ready.wait(timeout)
 
     def download_bulk_data(self, progress_callback: Callable[[str, float], None]):
         """
         Downloads the 'Oracle Cards' bulk file from Scryfall.
         Run this in a separate thread.
         """
+        import requests  # Deferred: only needed once we go to the network
+
         try:
             progress_callback("Fetching metadata...", 0.1)
             meta_response = requests.get(self.bulk_url, timeout=10)
@@ -67,16 +104,23 @@ class ScryfallRepository(CardRepository):
                 return
 
             progress_callback("Downloading database...", 0.2)
-            with requests.get(download_uri, stream=True) as r:
+            # Only accept gzip (or identity) so the compressed stream can be saved as-is
+            with requests.get(download_uri, stream=True, headers={'Accept-Encoding': 'gzip'}) as r:
                 r.raise_for_status()
+                gzipped = r.headers.get('content-encoding', '').lower() == 'gzip'
                 total_length = int(r.headers.get('content-length', 0))
                 dl = 0
+                if gzipped:
+                    chunks = r.raw.stream(65536, decode_content=False)
+                else:
+                    chunks = r.iter_content(chunk_size=65536)
                 
                 # Write to the secure path
-                with open(self.bulk_file, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
+                with BulkWriter(self.bulk_file, gzipped) as f:
+                    for chunk in chunks:
                         dl += len(chunk)
                         f.write(chunk)
+                        self.stats.record_bulk_bytes(len(chunk))
                         if total_length:
                             pct = 0.2 + (0.7 * (dl / total_length))
                             progress_callback(f"Downloading... {int(pct*100)}%", pct)
@@ -89,26 +133,21 @@ class ScryfallRepository(CardRepository):
             progress_callback(f"Error: {str(e)}", 0)
 
     def get_card_data(self, name: str, lang_name: str = "English") -> Optional[dict[str, Any]]:
-        print(f"\n[REPO] Requesting: {name} ({lang_name})")
+        logger.debug("Requesting: %s (%s)", name, lang_name)
         iso_lang = self.lang_codes.get(lang_name, "en")
-        
-        # 1. Check local small cache
-        cached_data = self.cache.get_card(name, lang_name)
-        if cached_data:
-            print(f"[REPO] Found in Cache: {name}")
-            return cached_data
+        start = time.perf_counter()
 
-        # 2. Check Bulk Database (Offline)
-        if iso_lang == "en" and name.lower() in self.bulk_index:
-            print(f"[REPO] Found in Bulk DB: {name}")
-            raw_data = self.bulk_index[name.lower()]
-            parsed = self._parse_card_data(raw_data)
-            self.cache.save_card(name, lang_name, parsed)
-            return parsed
+        # 1-2. Card cache and bulk database
+        offline_data = self.lookup_offline(name, lang_name, start)
+        if offline_data is not None:
+            return offline_data
 
         # 3. Fetch from Scryfall API
+        import requests  # Deferred: first network miss pays the import cost
+
+        tier = "api" if iso_lang == "en" else "localized_api"
         try:
-            print(f"[REPO] Fetching from API: {name}...")
+            logger.debug("Fetching from API: %s...", name)
             params = {'exact': name}
             response = requests.get(self.base_url, params=params, timeout=10)
 
@@ -121,22 +160,67 @@ class ScryfallRepository(CardRepository):
                     final_data = self._parse_card_data(card_json)
 
                 if final_data:
-                    self.cache.save_card(name, lang_name, final_data)
-
-                return final_data
+                    self.remember(name, lang_name, final_data)
+                    self.stats.record_hit(tier, time.perf_counter() - start)
+                    return final_data
             else:
-                 print(f"[REPO] API Error {response.status_code} for {name}")
+                logger.warning("API Error %s for %s", response.status_code, name)
+                if response.status_code != 404:
+                    self.stats.record_error(tier)
                 
         except requests.RequestException as e:
-            print(f"[REPO] Error connecting to Scryfall API: {e}")
+            logger.warning("Error connecting to Scryfall API: %s", e)
+            self.stats.record_error(tier)
 
+        self.stats.record_miss(time.perf_counter() - start)
         return None
 
+    def lookup_offline(self, name: str, lang_name: str = "English",
+                       start: Optional[float] = None) -> Optional[dict[str, Any]]:
+        """
+        Resolves a card from the card cache or bulk database without
+        touching the network. Blocks until the bulk index has loaded.
+
+        Args:
+            start: perf_counter() at the start of the lookup, for tier latency.
+        """
+        if start is None:
+            start = time.perf_counter()
+        iso_lang = self.lang_codes.get(lang_name, "en")
+
+        # 1. Check local small cache
+        cached_data = self.cache.get_card(name, lang_name)
+        if cached_data:
+            logger.debug("Found in Cache: %s", name)
+            self.stats.record_hit("cache", time.perf_counter() - start)
+            return cached_data
+
+        # 2. Check Bulk Database (Offline)
+        raw_data = None
+        if iso_lang == "en":
+            self._bulk_ready.wait()
+            raw_data = self.bulk_index.get(name.lower())
+        if raw_data is not None:
+            logger.debug("Found in Bulk DB: %s", name)
+            # Not copied into the card cache: the bulk database is already local,
+            # and caching it would rebuild a private parsed copy in every process
+            parsed = self._parse_card_data(raw_data)
+            self.stats.record_hit("bulk_db", time.perf_counter() - start)
+            return parsed
+
+        return None
+
+    def remember(self, name: str, lang_name: str, data: dict[str, Any], defer_save: bool = False):
+        """Stores a resolved card in the card cache."""
+        self.cache.save_card(name, lang_name, data, defer=defer_save)
+
     def _get_localized_version(self, card_json: dict, iso_lang: str) -> dict:
         oracle_id = card_json.get("oracle_id")
         if not oracle_id:
             return self._parse_card_data(card_json)
 
+        import requests
+
         query = f'oracleid:{oracle_id} lang:{iso_lang} unique:prints'
         try:
             r = requests.get(self.search_url, params={'q': query}, timeout=10)
@@ -144,57 +228,65 @@ class ScryfallRepository(CardRepository):
                 data = r.json()
                 if data.get("total_cards", 0) > 0:
                     return self._parse_card_data(data["data"][0])
-        except requests.RequestException:
-            pass
+            elif r.status_code != 404:
+                self.stats.record_error("localized_api")
+        except requests.RequestException as e:
+            logger.warning("Localized search failed for %s: %s", oracle_id, e)
+            self.stats.record_error("localized_api")
         return self._parse_card_data(card_json)
 
     def _parse_card_data(self, data: dict) -> dict[str, Any]:
-        parsed = {
-            "name": data.get("printed_name") or data.get("name"),
-            "mana": data.get("mana_cost", ""),
-            "type": data.get("printed_type_line") or data.get("type_line"),
-            "desc": data.get("printed_text") or data.get("oracle_text", ""),
-            "pt": "N/A",
-            "image_url": None
-        }
-
-        # --- IMAGE EXTRACTION ---
-        if "image_uris" in data:
-            parsed["image_url"] = data["image_uris"].get("normal")
-        elif "card_faces" in data:
-            faces = data["card_faces"]
-            if len(faces) > 0 and "image_uris" in faces[0]:
-                parsed["image_url"] = faces[0]["image_uris"].get("normal")
-        
-        # --- PT Logic ---
-        if "power" in data and "toughness" in data:
-             parsed["pt"] = f"{data['power']}/{data['toughness']}"
+        return parse_card_data(data)
 
-        # --- Multi-face Logic ---
-        if "card_faces" in data:
-            faces = data["card_faces"]
-            
-            mana_list = [f.get("mana_cost", "") for f in faces]
-            combined_mana = " // ".join([m for m in mana_list if m])
-            if combined_mana: parsed["mana"] = combined_mana
-
-            desc_lines = []
-            for f in faces:
-                name = f.get("printed_name") or f.get("name")
-                text = f.get("printed_text") or f.get("oracle_text", "")
-                if text: desc_lines.append(f"[{name}]:\n{text}")
-            if desc_lines: parsed["desc"] = "\n\n--- // ---\n\n".join(desc_lines)
-            
-            if not parsed["type"]:
-                 parsed["type"] = " // ".join([f.get("type_line", "") for f in faces])
-
-            pt_list = []
-            has_pt = False
-            for f in faces:
-                if "power" in f and "toughness" in f:
-                    pt_list.append(f"{f['power']}/{f['toughness']}")
-                    has_pt = True
-                else: pt_list.append("-")
-            if has_pt: parsed["pt"] = " // ".join(pt_list)
-
-        return parsed
\ No newline at end of file
+
+def parse_card_data(data: dict) -> dict[str, Any]:
+    """Flattens a Scryfall card object into the fields Buildeck displays and exports."""
+    parsed = {
+        "name": data.get("printed_name") or data.get("name"),
+        "mana": data.get("mana_cost", ""),
+        "type": data.get("printed_type_line") or data.get("type_line"),
+        "desc": data.get("printed_text") or data.get("oracle_text", ""),
+        "pt": "N/A",
+        "image_url": None
+    }
+
+    # --- IMAGE EXTRACTION ---
+    if "image_uris" in data:
+        parsed["image_url"] = data["image_uris"].get("normal")
+    elif "card_faces" in data:
+        faces = data["card_faces"]
+        if len(faces) > 0 and "image_uris" in faces[0]:
+            parsed["image_url"] = faces[0]["image_uris"].get("normal")
+
+    # --- PT Logic ---
+    if "power" in data and "toughness" in data:
+         parsed["pt"] = f"{data['power']}/{data['toughness']}"
+
+    # --- Multi-face Logic ---
+    if "card_faces" in data:
+        faces = data["card_faces"]
+
+        mana_list = [f.get("mana_cost", "") for f in faces]
+        combined_mana = " // ".join([m for m in mana_list if m])
+        if combined_mana: parsed["mana"] = combined_mana
+
+        desc_lines = []
+        for f in faces:
+            name = f.get("printed_name") or f.get("name")
+            text = f.get("printed_text") or f.get("oracle_text", "")
+            if text: desc_lines.append(f"[{name}]:\n{text}")
+        if desc_lines: parsed["desc"] = "\n\n--- // ---\n\n".join(desc_lines)
+
+        if not parsed["type"]:
+             parsed["type"] = " // ".join([f.get("type_line", "") for f in faces])
+
+        pt_list = []
+        has_pt = False
+        for f in faces:
+            if "power" in f and "toughness" in f:
+                pt_list.append(f"{f['power']}/{f['toughness']}")
+                has_pt = True
+            else: pt_list.append("-")
+        if has_pt: parsed["pt"] = " // ".join(pt_list)
+
+    return parsed
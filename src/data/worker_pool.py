@@ -0,0 +1,111 @@
+"""
+Multi-process card resolution sharing one read-only card index.
+
+Every worker process opens the same memory-mapped index file (see
+`card_index.py`), so adding workers adds CPU throughput without adding a
+private copy of the bulk database per process. Card cache writes only append
+to a locked journal (see `cache_manager.py`), so workers never lose each
+other's entries, nor those of a GUI running at the same time.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Optional
+
+from src.core.decklist import parse_decklist
+from src.core.paths import get_user_data_dir
+from src.data.bulk_storage import BULK_FILE, migrate_legacy_bulk
+from src.data.card_index import MappedCardIndex
+from src.data.scryfall_repository import ScryfallRepository
+
+# One repository per worker process, created by `_init_worker`
+_worker_repo: Optional[ScryfallRepository] = None
+
+
+def _init_worker(api_root: str, data_dir: str):
+    global _worker_repo
+    _worker_repo = ScryfallRepository(api_root=api_root, data_dir=data_dir)
+
+
+def _resolve_batch(names: list[str], lang_name: str) -> list[Optional[dict[str, Any]]]:
+    repo = _worker_repo
+    assert repo is not None, "worker not initialized"
+    # One locked cache write per batch instead of one per card
+    with repo.cache.batch():
+        return [repo.get_card_data(name, lang_name=lang_name) for name in names]
+
+
+class CardResolverPool:
+    """
+    Process pool that resolves card names in parallel.
+
+    Usage:
+        with CardResolverPool(workers=4) as pool:
+            cards = pool.resolve_decklist(lines, "English")
+    """
+
+    def __init__(self, workers: Optional[int] = None, api_root: str = "https://api.scryfall.com",
+                 data_dir: Optional[str] = None):
+        data_dir = data_dir or get_user_data_dir()
+        # Migrate and build (or refresh) the index once here so workers only ever map it
+        migrate_legacy_bulk(data_dir)
+        index = MappedCardIndex.ensure(os.path.join(data_dir, BULK_FILE),
+                                       os.path.join(data_dir, "scryfall_oracle_cards.idx"))
+        if index is not None:
+            index.close()
+
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(api_root, data_dir))
+
+    def resolve(self, names: list[str], lang_name: str = "English",
+                chunksize: int = 16) -> list[Optional[dict[str, Any]]]:
+        """Resolves `names` in order, `chunksize` per task; unresolved names yield None."""
+        chunks = [names[i:i + chunksize] for i in range(0, len(names), chunksize)]
+        results = []
+        for batch in self._executor.map(_resolve_batch, chunks, repeat(lang_name)):
+            results.extend(batch)
+        return results
+
+    def resolve_decklist(self, lines: list[str], lang_name: str = "English") -> list[dict[str, Any]]:
+        """Same output as the window's processing loop: found cards with their quantity."""
+        card_totals = parse_decklist(lines)
+        infos = list(card_totals.values())
+        results = []
+        for info, data in zip(infos, self.resolve([i["name"] for i in infos], lang_name)):
+            if data:
+                data["quantity"] = info["qty"]
+                results.append(data)
+        return results
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self) -> "CardResolverPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import logging
+
+    from assets.locales import LANGUAGES
+    from src.core.decklist import write_csv
+
+    parser = argparse.ArgumentParser(description="Convert decklists to CSV using a process pool.")
+    parser.add_argument("decklists", nargs="+", help="Text files, one card per line")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--lang", default="English", choices=list(LANGUAGES.keys()))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with CardResolverPool(workers=args.workers) as pool:
+        for path in args.decklists:
+            with open(path, encoding="utf-8") as f:
+                lines = [line.strip() for line in f if line.strip()]
+            cards = pool.resolve_decklist(lines, args.lang)
+            out_path = os.path.splitext(path)[0] + ".csv"
+            write_csv(out_path, cards, LANGUAGES[args.lang]["columns"])
+            print(f"{path}: {len(cards)} cards -> {out_path}")
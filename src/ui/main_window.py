@@ -1,24 +1,28 @@
-import csv
-import re
+import logging
 import threading
 import os
-import requests
 import sys
 from tkinter import filedialog, messagebox
 
-# Image handling imports
-from PIL import Image
+# Only customtkinter is needed to build the window. csv, requests, PIL and
+# pyperclip are imported where they are first used to keep startup fast.
 import customtkinter as ctk  # type: ignore
-import pyperclip  # type: ignore
 
 from assets.locales import LANGUAGES
+from src.core.decklist import parse_decklist, to_clipboard_text, write_csv
+from src.core.interfaces import AsyncCardRepository
+from src.core.metrics import LookupStats
 from src.core.paths import get_user_data_dir
 
+logger = logging.getLogger(__name__)
+
 class MainWindow(ctk.CTk):
     def __init__(self, card_repo):
         super().__init__()
         
         self.repo = card_repo
+        # Share the repository's stats object so image metrics land in the same report
+        self.stats = getattr(card_repo, "stats", None) or LookupStats()
         self.current_lang = "English"
         self.extracted_data = [] 
         
@@ -30,6 +34,14 @@ class MainWindow(ctk.CTk):
         # --- RAM Cache for Images ---
         self.ram_image_cache = {}
 
+        # --- Async repositories run on one shared event-loop thread ---
+        self.loop_thread = None
+        self.processing_future = None
+        if isinstance(card_repo, AsyncCardRepository):
+            from src.core.event_loop import EventLoopThread
+            self.loop_thread = EventLoopThread().start()
+            self.protocol("WM_DELETE_WINDOW", self._on_close)
+
         self.geometry("1100x750")
         self.setup_ui()
         self.update_ui_text()
@@ -168,6 +180,9 @@ class MainWindow(ctk.CTk):
         self.btn_db.configure(state="disabled")
         self.progress_bar.pack(pady=5, fill="x", before=self.txt_input)
         self.status_label.configure(text=lang["status_downloading"])
+        if self.loop_thread:
+            self.loop_thread.submit(self.repo.download_bulk_data(self.update_download_progress))
+            return
         thread = threading.Thread(target=self.run_download_task, daemon=True)
         thread.start()
 
@@ -198,28 +213,22 @@ class MainWindow(ctk.CTk):
 
         self.btn_process.configure(state="disabled")
         self.status_label.configure(text=lang["status_wait"])
+
+        if self.loop_thread:
+            # A newer run supersedes the previous one, like the token check in the sync loop
+            if self.processing_future is not None:
+                self.processing_future.cancel()
+            future = self.loop_thread.submit(self._run_processing_async(lines, current_token))
+            future.add_done_callback(lambda f: self._on_processing_done(f, current_token))
+            self.processing_future = future
+            return
         
         thread = threading.Thread(target=self._run_processing_task, args=(lines, current_token), daemon=True)
         thread.start()
 
     def _run_processing_task(self, lines, token):
         lang = LANGUAGES[self.current_lang]
-        card_totals = {}
-        for line in lines:
-            if line.startswith("//"): continue
-            match = re.match(r"^(\d+)[xX]?\s+(.+)$", line)
-            if match:
-                qty = int(match.group(1))
-                name = match.group(2).strip()
-            else:
-                qty = 1
-                name = line.strip()
-            name = name.split("(")[0].strip()
-            key = name.lower()
-            if key in card_totals:
-                card_totals[key]["qty"] += qty
-            else:
-                card_totals[key] = {"qty": qty, "name": name}
+        card_totals = parse_decklist(lines)
 
         total_unique = len(card_totals)
         processed_count = 0
@@ -240,6 +249,58 @@ class MainWindow(ctk.CTk):
         if self.current_process_token == token:
             self.after(0, lambda: self._finish_processing(temp_results))
 
+    async def _run_processing_async(self, lines, token):
+        import asyncio
+
+        lang = LANGUAGES[self.current_lang]
+        card_totals = parse_decklist(lines)
+
+        total_unique = len(card_totals)
+        processed_count = 0
+
+        async def fetch(info):
+            nonlocal processed_count
+            data = await self.repo.get_card_data(info["name"], lang_name=self.current_lang)
+            if self.current_process_token != token:
+                return None
+            processed_count += 1
+            msg = f"{lang['status_wait']} ({processed_count}/{total_unique})"
+            self.after(0, lambda m=msg: self.status_label.configure(text=m))
+            return data
+
+        # All lookups run concurrently; results keep the decklist order.
+        # One failing card must not abort the others.
+        infos = list(card_totals.values())
+        results = await asyncio.gather(*(fetch(info) for info in infos), return_exceptions=True)
+
+        temp_results = []
+        for info, data in zip(infos, results):
+            if isinstance(data, Exception):
+                logger.error("Lookup failed for %s: %s", info["name"], data)
+                continue
+            if data:
+                data["quantity"] = info["qty"]
+                temp_results.append(data)
+
+        if self.current_process_token == token:
+            self.after(0, lambda: self._finish_processing(temp_results))
+
+    def _on_processing_done(self, future, token):
+        # Runs on the loop thread; anything that escaped the coroutine ends up here
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            return
+        logger.error("Processing failed", exc_info=error)
+        if self.current_process_token == token:
+            self.after(0, self._fail_processing)
+
+    def _fail_processing(self):
+        lang = LANGUAGES[self.current_lang]
+        self.status_label.configure(text=lang["status_error"])
+        self.btn_process.configure(state="normal")
+
     def _finish_processing(self, results):
         lang = LANGUAGES[self.current_lang]
         self.extracted_data = results
@@ -252,7 +313,7 @@ class MainWindow(ctk.CTk):
         self._clear_details_panel()
 
     def render_card_list(self):
-        print(f"[UI] Rendering {len(self.extracted_data)} cards to list.")
+        logger.debug("Rendering %d cards to list.", len(self.extracted_data))
         for widget in self.scroll_frame.winfo_children():
             widget.destroy()
 
@@ -275,7 +336,7 @@ class MainWindow(ctk.CTk):
             self._bind_mouse_wheel_recursive(btn)
 
     def on_card_selected(self, card_data, button_widget):
-        print(f"[UI] Card Selected: {card_data.get('name')}")
+        logger.debug("Card Selected: %s", card_data.get('name'))
         
         if self.selected_button is not None:
             try:
@@ -309,24 +370,17 @@ class MainWindow(ctk.CTk):
         self.txt_desc.configure(state="disabled")
 
     def copy_to_clipboard(self):
+        import pyperclip  # type: ignore
+
         lang = LANGUAGES[self.current_lang]
-        header = "\t".join(lang["columns"])
-        body = ""
-        for d in self.extracted_data:
-            body += f"\n{d['quantity']}\t{d['name']}\t{d['mana']}\t{d['type']}\t{d['desc']}\t{d['pt']}"
-        pyperclip.copy(header + body)
+        pyperclip.copy(to_clipboard_text(self.extracted_data, lang["columns"]))
         messagebox.showinfo("Buildeck", lang["msg_copy"])
 
     def download_csv(self):
         lang = LANGUAGES[self.current_lang]
         path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
         if path:
-            field_order = ["quantity", "name", "mana", "type", "desc", "pt"]
-            header_map = dict(zip(field_order, lang["columns"]))
-            with open(path, mode="w", newline="", encoding="utf-8-sig") as f:
-                writer = csv.DictWriter(f, fieldnames=field_order)
-                writer.writerow(header_map)
-                writer.writerows(self.extracted_data)
+            write_csv(path, self.extracted_data, lang["columns"])
             messagebox.showinfo("Buildeck", lang["msg_save"])
 
     # --- IMAGE LOGIC (THREAD SAFE + RAM CACHE + SAFE PATHS) ---
@@ -337,59 +391,111 @@ class MainWindow(ctk.CTk):
 
         # 1. RAM Cache check
         if url in self.ram_image_cache:
-            print(f"[UI] Loaded from RAM cache: {url}")
+            logger.debug("Loaded from RAM cache: %s", url)
+            self.stats.record_image_hit("ram")
             self.image_label.configure(image=self.ram_image_cache[url], text="")
             return
         
-        print(f"[UI] Requesting Image: {url}")
+        logger.debug("Requesting Image: %s", url)
         self.current_image_token += 1
         my_token = self.current_image_token
         
         self.image_label.configure(image=None, text="Loading...")
 
+        if self.loop_thread:
+            self.loop_thread.submit(self._load_image_async(url, my_token))
+            return
+
         def task():
             try:
-                filename = url.split("/")[-1].split("?")[0]
-                if "." not in filename: filename += ".jpg"
-                
-                # USE SAFE PATH FROM PATHS.PY
-                base_dir = get_user_data_dir()
-                cache_dir = os.path.join(base_dir, "images")
-                
-                cache_path = os.path.join(cache_dir, filename)
-                os.makedirs(cache_dir, exist_ok=True)
+                import requests
 
-                # Check corrupt file
-                if os.path.exists(cache_path):
-                    if os.path.getsize(cache_path) == 0:
-                        os.remove(cache_path)
+                cache_path = self._image_cache_path(url)
 
                 if not os.path.exists(cache_path):
-                    print(f"[UI] Downloading...")
+                    logger.debug("Downloading %s", url)
                     res = requests.get(url, timeout=10)
                     if res.status_code == 200:
                         with open(cache_path, "wb") as f:
                             f.write(res.content)
+                        self.stats.record_image_download(len(res.content))
                     else:
-                        print(f"[UI ERROR] HTTP {res.status_code}")
+                        logger.warning("Image HTTP %s for %s", res.status_code, url)
                         return
+                else:
+                    self.stats.record_image_hit("disk")
 
                 if self.current_image_token != my_token:
                     return
 
-                pil_img = Image.open(cache_path)
-                pil_img.load() 
+                pil_img = self._open_image(cache_path)
                 
-                print("[UI] Sending PIL image to main thread.")
                 self.after(0, lambda: self._update_image_label(pil_img, url, my_token))
                 
             except Exception as e:
-                print(f"[UI FATAL] Image Task Failed: {e}")
+                logger.error("Image Task Failed: %s", e)
                 if self.current_image_token == my_token:
                     self.after(0, lambda: self.image_label.configure(text="Image Error"))
 
         threading.Thread(target=task, daemon=True).start()
 
+    async def _load_image_async(self, url, my_token):
+        import asyncio
+
+        try:
+            # makedirs/stat/remove can block on slow disks; keep them off the event loop
+            cache_path, cached = await asyncio.to_thread(self._probe_image_cache, url)
+
+            if not cached:
+                logger.debug("Downloading %s", url)
+                if not await self.repo.download_image(url, cache_path):
+                    return
+            else:
+                self.stats.record_image_hit("disk")
+
+            if self.current_image_token != my_token:
+                return
+
+            # Decoding is CPU work; keep it off the event loop
+            pil_img = await asyncio.to_thread(self._open_image, cache_path)
+
+            self.after(0, lambda: self._update_image_label(pil_img, url, my_token))
+
+        except Exception as e:
+            logger.error("Image Task Failed: %s", e)
+            if self.current_image_token == my_token:
+                self.after(0, lambda: self.image_label.configure(text="Image Error"))
+
+    def _image_cache_path(self, url):
+        filename = url.split("/")[-1].split("?")[0]
+        if "." not in filename: filename += ".jpg"
+
+        # USE SAFE PATH FROM PATHS.PY
+        base_dir = get_user_data_dir()
+        cache_dir = os.path.join(base_dir, "images")
+
+        cache_path = os.path.join(cache_dir, filename)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Check corrupt file
+        if os.path.exists(cache_path):
+            if os.path.getsize(cache_path) == 0:
+                os.remove(cache_path)
+        return cache_path
+
+    def _probe_image_cache(self, url):
+        """Returns the cache path for `url` and whether a usable copy is already there."""
+        cache_path = self._image_cache_path(url)
+        return cache_path, os.path.exists(cache_path)
+
+    @staticmethod
+    def _open_image(path):
+        from PIL import Image
+
+        pil_img = Image.open(path)
+        pil_img.load()
+        return pil_img
+
     def _update_image_label(self, pil_image, url, token_at_start):
         if self.current_image_token == token_at_start:
             try:
@@ -397,6 +503,15 @@ class MainWindow(ctk.CTk):
                 # Save to RAM
                 self.ram_image_cache[url] = ctk_image
                 self.image_label.configure(image=ctk_image, text="")
-                print("[UI] Image rendered and cached successfully.")
+                logger.debug("Image rendered and cached successfully.")
             except Exception as e:
-                print(f"[UI ERROR] Rendering failed: {e}")
\ No newline at end of file
+                logger.error("Rendering failed: %s", e)
+
+    def _on_close(self):
+        # Flush the card cache and close HTTP connections before the loop stops
+        try:
+            self.loop_thread.submit(self.repo.aclose()).result(timeout=5)
+        except Exception as e:
+            logger.error("Async shutdown failed: %s", e)
+        self.loop_thread.stop()
+        self.destroy()
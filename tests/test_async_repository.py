@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from benchmarks.stub_server import ScryfallStub
+from benchmarks.synthetic import generate_oracle_cards
+from src.data.async_scryfall_repository import AsyncScryfallRepository
+from src.data.cache_manager import CacheManager
+
+CARDS = generate_oracle_cards(8, seed=7)
+NAMES = [card["name"] for card in CARDS]
+
+
+@pytest.fixture
+def stub():
+    with ScryfallStub(CARDS, retry_after=0.01) as server:
+        yield server
+
+
+def resolve(stub, data_dir, names):
+    """Looks `names` up concurrently through the API (data_dir has no bulk database)."""
+    async def run():
+        repo = AsyncScryfallRepository(api_root=stub.url, data_dir=data_dir)
+        try:
+            return await repo.get_cards_data(names)
+        finally:
+            await repo.aclose()
+    return asyncio.run(run())
+
+
+def test_retries_rate_limited_requests(stub, tmp_path):
+    # Every other request gets a 429; one card at a time, every card but the first retries once
+    stub.rate_limit_every = 2
+    results = [resolve(stub, str(tmp_path), [name])[0] for name in NAMES]
+    assert stub.rate_limited_count == len(NAMES) - 1
+    assert [card["name"] for card in results] == NAMES
+
+
+def test_identical_lookups_share_one_request(stub, tmp_path):
+    stub.latency = 0.05
+    results = resolve(stub, str(tmp_path), [NAMES[0]] * 5)
+    assert stub.request_count == 1
+    assert all(card == results[0] for card in results)
+
+
+def test_close_flushes_the_cache(stub, tmp_path):
+    resolve(stub, str(tmp_path), NAMES[:3])  # Closes before the delayed flush is due
+    cache = CacheManager(data_dir=str(tmp_path))
+    for name in NAMES[:3]:
+        assert cache.get_card(name, "English")["name"] == name
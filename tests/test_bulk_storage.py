@@ -0,0 +1,70 @@
+import gzip
+import json
+
+import pytest
+
+from src.data.bulk_storage import (BULK_FILE, LEGACY_BULK_FILE, BulkWriter, load_bulk_cards,
+                                   migrate_legacy_bulk)
+from src.data.scryfall_repository import ScryfallRepository
+
+CARDS = [
+    {"name": "Lightning Bolt", "mana_cost": "{R}", "type_line": "Instant", "oracle_text": "Deal 3."},
+    {"name": "Island", "mana_cost": "", "type_line": "Basic Land — Island", "oracle_text": ""},
+]
+# Scryfall's layout: a JSON array with one card per line
+LINES = ("[\n" + ",\n".join(json.dumps(card) for card in CARDS) + "\n]\n").encode("utf-8")
+
+
+@pytest.mark.parametrize("data", [LINES, json.dumps(CARDS).encode("utf-8")])
+@pytest.mark.parametrize("compressed", [True, False])
+def test_load_bulk_cards(tmp_path, data, compressed):
+    path = tmp_path / "bulk"
+    path.write_bytes(gzip.compress(data) if compressed else data)
+    assert load_bulk_cards(str(path)) == CARDS
+
+
+def test_load_multi_member_gzip(tmp_path):
+    path = tmp_path / "bulk.gz"
+    path.write_bytes(gzip.compress(LINES[:10]) + gzip.compress(LINES[10:]))
+    assert load_bulk_cards(str(path)) == CARDS
+
+
+@pytest.mark.parametrize("gzipped", [True, False])
+def test_bulk_writer(tmp_path, gzipped):
+    path = tmp_path / BULK_FILE
+    payload = gzip.compress(LINES) if gzipped else LINES
+    with BulkWriter(str(path), gzipped) as writer:
+        for i in range(0, len(payload), 7):
+            writer.write(payload[i:i + 7])
+    assert gzip.decompress(path.read_bytes()) == LINES
+    assert not (tmp_path / (BULK_FILE + ".part")).exists()
+
+
+def test_bulk_writer_abort_keeps_previous_file(tmp_path):
+    path = tmp_path / BULK_FILE
+    path.write_bytes(gzip.compress(LINES))
+    with pytest.raises(RuntimeError):
+        with BulkWriter(str(path), gzipped=True) as writer:
+            writer.write(b"partial")
+            raise RuntimeError("connection lost")
+    assert load_bulk_cards(str(path)) == CARDS
+    assert not (tmp_path / (BULK_FILE + ".part")).exists()
+
+
+def test_migrates_legacy_bulk(tmp_path):
+    (tmp_path / LEGACY_BULK_FILE).write_bytes(json.dumps(CARDS).encode("utf-8"))
+
+    assert migrate_legacy_bulk(str(tmp_path))
+    assert not (tmp_path / LEGACY_BULK_FILE).exists()
+    assert load_bulk_cards(str(tmp_path / BULK_FILE)) == CARDS
+    assert not migrate_legacy_bulk(str(tmp_path))
+
+
+def test_repository_loads_migrated_bulk(tmp_path):
+    (tmp_path / LEGACY_BULK_FILE).write_bytes(LINES)
+
+    repo = ScryfallRepository(api_root="http://127.0.0.1:9", data_dir=str(tmp_path))
+    assert repo.wait_until_ready(timeout=10)
+    assert (tmp_path / BULK_FILE).exists()
+    assert not (tmp_path / LEGACY_BULK_FILE).exists()
+    assert repo.get_card_data("Lightning Bolt")["name"] == "Lightning Bolt"
@@ -0,0 +1,164 @@
+import json
+import os
+import struct
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from src.data import cache_manager
+from src.data.cache_manager import (CACHE_FILE, JOURNAL_MAGIC, JOURNAL_SUFFIX, LEGACY_CACHE_FILE, MAGIC,
+                                    CacheManager)
+
+CARD = {"name": "Lightning Bolt", "mana": "{R}", "type": "Instant", "desc": "Deal 3.", "pt": ""}
+
+
+def read_snapshot(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    assert raw.startswith(MAGIC)
+    return json.loads(zlib.decompress(raw[len(MAGIC):]))
+
+
+def test_round_trip(tmp_path):
+    cache = CacheManager(data_dir=str(tmp_path))
+    cache.save_card("Lightning Bolt", "English", CARD)
+
+    reopened = CacheManager(data_dir=str(tmp_path))
+    assert reopened.get_card("lightning bolt", "english") == CARD
+    assert reopened.get_card("Counterspell", "English") is None
+
+
+def test_snapshot_format_after_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_manager, "JOURNAL_COMPACT_MIN", 0)
+    monkeypatch.setattr(cache_manager, "JOURNAL_COMPACT_RATIO", 0)
+    cache = CacheManager(data_dir=str(tmp_path))
+    cache.save_card("Lightning Bolt", "English", CARD)
+
+    snapshot = read_snapshot(tmp_path / CACHE_FILE)
+    assert snapshot["lightning bolt_english"]["payload"] == CARD
+    assert isinstance(snapshot["lightning bolt_english"]["timestamp"], float)
+    assert os.path.getsize(tmp_path / (CACHE_FILE + JOURNAL_SUFFIX)) == 0
+    assert CacheManager(data_dir=str(tmp_path)).get_card("Lightning Bolt", "English") == CARD
+
+
+def test_expired_entries(tmp_path, monkeypatch):
+    cache = CacheManager(data_dir=str(tmp_path))
+    cache.save_card("Island", "English", {"name": "Island"})
+    cache.data["island_english"]["timestamp"] -= cache_manager.CACHE_TTL + 1
+    assert cache.get_card("Island", "English") is None
+
+    # Compaction drops expired entries from disk
+    old = {"lightning bolt_english": {"timestamp": time.time() - cache_manager.CACHE_TTL - 1, "payload": CARD}}
+    with cache_manager.FileLock(cache.cache_file):
+        cache._append_journal(old)
+    assert CacheManager(data_dir=str(tmp_path)).get_card("Lightning Bolt", "English") is None
+    monkeypatch.setattr(cache_manager, "JOURNAL_COMPACT_MIN", 0)
+    monkeypatch.setattr(cache_manager, "JOURNAL_COMPACT_RATIO", 0)
+    cache.save_card("Forest", "English", {"name": "Forest"})
+    assert set(read_snapshot(tmp_path / CACHE_FILE)) == {"island_english", "forest_english"}
+
+
+def test_corrupt_snapshot_starts_empty(tmp_path):
+    (tmp_path / CACHE_FILE).write_bytes(b"not a cache")
+    assert CacheManager(data_dir=str(tmp_path)).data == {}
+
+
+def test_writers_never_lose_each_others_entries(tmp_path):
+    first = CacheManager(data_dir=str(tmp_path))
+    second = CacheManager(data_dir=str(tmp_path))
+    first.save_card("Lightning Bolt", "English", CARD)
+    second.save_card("Island", "English", {"name": "Island"})
+
+    merged = CacheManager(data_dir=str(tmp_path))
+    assert merged.get_card("Lightning Bolt", "English") == CARD
+    assert merged.get_card("Island", "English") == {"name": "Island"}
+
+
+def test_compaction_keeps_other_writers_entries(tmp_path, monkeypatch):
+    first = CacheManager(data_dir=str(tmp_path))
+    second = CacheManager(data_dir=str(tmp_path))
+    first.save_card("Lightning Bolt", "English", CARD)
+
+    monkeypatch.setattr(cache_manager, "JOURNAL_COMPACT_MIN", 0)
+    monkeypatch.setattr(cache_manager, "JOURNAL_COMPACT_RATIO", 0)
+    second.save_card("Island", "English", {"name": "Island"})
+
+    assert set(read_snapshot(tmp_path / CACHE_FILE)) == {"lightning bolt_english", "island_english"}
+    # The compacting process also picks up the other writer's entries
+    assert second.get_card("Lightning Bolt", "English") == CARD
+
+
+def test_torn_journal_frame_is_skipped(tmp_path):
+    cache = CacheManager(data_dir=str(tmp_path))
+    cache.save_card("Lightning Bolt", "English", CARD)
+    with open(tmp_path / (CACHE_FILE + JOURNAL_SUFFIX), "ab") as f:
+        f.write(struct.pack("<4sI", JOURNAL_MAGIC, 500) + b"x\x9c\xab")
+    cache.save_card("Forest", "English", {"name": "Forest"})
+
+    reopened = CacheManager(data_dir=str(tmp_path))
+    assert reopened.get_card("Lightning Bolt", "English") == CARD
+    assert reopened.get_card("Forest", "English") == {"name": "Forest"}
+    assert reopened.get_card("Island", "English") is None
+
+
+def test_batch_defers_writes(tmp_path):
+    journal = tmp_path / (CACHE_FILE + JOURNAL_SUFFIX)
+    cache = CacheManager(data_dir=str(tmp_path))
+    with cache.batch():
+        cache.save_card("Lightning Bolt", "English", CARD)
+        cache.save_card("Island", "English", {"name": "Island"})
+        assert not journal.exists()
+    raw = journal.read_bytes()
+    magic, length = struct.unpack_from("<4sI", raw)
+    assert magic == JOURNAL_MAGIC and 8 + length == len(raw)
+
+
+def test_opening_compacts_the_journal(tmp_path):
+    CacheManager(data_dir=str(tmp_path)).save_card("Lightning Bolt", "English", CARD)
+    assert os.path.getsize(tmp_path / (CACHE_FILE + JOURNAL_SUFFIX)) > 0
+
+    cache = CacheManager(data_dir=str(tmp_path))
+    assert os.path.getsize(tmp_path / (CACHE_FILE + JOURNAL_SUFFIX)) == 0
+    assert read_snapshot(tmp_path / CACHE_FILE)["lightning bolt_english"]["payload"] == CARD
+    assert cache.get_card("Lightning Bolt", "English") == CARD
+
+
+def test_smaller_than_legacy_format(tmp_path):
+    cards = [{"name": f"Storm Crow {i}", "mana": "{1}{U}", "type": "Creature — Bird",
+              "desc": "Flying", "pt": "1/2",
+              "image_url": f"https://cards.scryfall.io/normal/front/{i:08x}.jpg"} for i in range(200)]
+    cache = CacheManager(data_dir=str(tmp_path))
+    for card in cards:
+        cache.save_card(card["name"], "English", card)  # One journal frame each
+
+    legacy = {key: {"timestamp": datetime.fromtimestamp(item["timestamp"]).isoformat(),
+                    "payload": item["payload"]} for key, item in cache.data.items()}
+    legacy_size = len(json.dumps(legacy, indent=4).encode("utf-8"))
+    assert os.path.getsize(tmp_path / (CACHE_FILE + JOURNAL_SUFFIX)) < legacy_size / 2
+
+    CacheManager(data_dir=str(tmp_path))  # Compacts into the snapshot
+    assert os.path.getsize(tmp_path / CACHE_FILE) < legacy_size / 10
+
+
+def test_migrates_legacy_json_cache(tmp_path):
+    now = datetime.now()
+    legacy = {
+        "lightning bolt_english": {"timestamp": now.isoformat(), "payload": CARD},
+        "island_english": {"timestamp": (now - timedelta(days=2)).isoformat(), "payload": {"name": "Island"}},
+    }
+    (tmp_path / LEGACY_CACHE_FILE).write_text(json.dumps(legacy, indent=4), encoding="utf-8")
+
+    cache = CacheManager(data_dir=str(tmp_path))
+
+    assert not (tmp_path / LEGACY_CACHE_FILE).exists()
+    snapshot = read_snapshot(tmp_path / CACHE_FILE)
+    assert abs(snapshot["lightning bolt_english"]["timestamp"] - time.time()) < 60
+    assert cache.get_card("Lightning Bolt", "English") == CARD
+    assert cache.get_card("Island", "English") is None
+
+
+def test_unreadable_legacy_cache_is_left_alone(tmp_path):
+    (tmp_path / LEGACY_CACHE_FILE).write_text("{broken", encoding="utf-8")
+    cache = CacheManager(data_dir=str(tmp_path))
+    assert cache.data == {}
+    assert (tmp_path / LEGACY_CACHE_FILE).exists()
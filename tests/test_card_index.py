@@ -0,0 +1,106 @@
+import gzip
+import json
+import os
+import struct
+
+import pytest
+
+from src.data.card_index import MAGIC, MappedCardIndex, build_index, index_path_for
+
+CARDS = [
+    {"name": "Lightning Bolt", "mana_cost": "{R}", "type_line": "Instant"},
+    {"name": "Fire // Ice", "mana_cost": "{1}{R} // {1}{U}", "type_line": "Instant // Instant"},
+    {"name": "Jötun Grunt", "mana_cost": "{1}{W}", "type_line": "Creature — Giant Soldier"},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "cards.idx")
+    build_index(CARDS, path)
+    mapped = MappedCardIndex(path)
+    yield mapped
+    mapped.close()
+
+
+def test_round_trip(index):
+    assert len(index) == 3
+    for card in CARDS:
+        assert index[card["name"]] == card
+        assert index.get(card["name"].lower()) == card
+    assert sorted(index) == sorted(card["name"].lower() for card in CARDS)
+
+
+def test_missing_names(index):
+    assert "Counterspell" not in index
+    assert index.get("Counterspell") is None
+    assert 42 not in index
+    with pytest.raises(KeyError):
+        index["Counterspell"]
+
+
+def test_duplicates_keep_the_last_card(tmp_path):
+    path = str(tmp_path / "cards.idx")
+    build_index([{"name": "Island", "v": 1}, {"name": "island", "v": 2}], path)
+    mapped = MappedCardIndex(path)
+    try:
+        assert len(mapped) == 1
+        assert mapped["Island"]["v"] == 2
+    finally:
+        mapped.close()
+
+
+def test_header(tmp_path):
+    path = str(tmp_path / "cards.idx")
+    build_index(CARDS, path)
+    with open(path, "rb") as f:
+        magic, version, count, table = struct.unpack("<4sIIQ", f.read(20))
+    assert (magic, version, count) == (MAGIC, 1, 3)
+    assert table + count * 20 == os.path.getsize(path)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "cards.idx"
+    path.write_bytes(b"XXXX" + bytes(16))
+    with pytest.raises(ValueError):
+        MappedCardIndex(str(path))
+
+
+def test_ensure(tmp_path):
+    bulk = tmp_path / "bulk.json.gz"
+    index_file = str(tmp_path / "cards.idx")
+    assert MappedCardIndex.ensure(str(bulk), index_file) is None
+
+    bulk.write_bytes(gzip.compress(json.dumps(CARDS).encode("utf-8")))
+    mapped = MappedCardIndex.ensure(str(bulk), index_file)
+    assert mapped is not None
+    assert mapped.index_file == index_path_for(str(bulk), index_file)
+    assert len(mapped) == 3
+
+    # Reused while the bulk file is unchanged
+    again = MappedCardIndex.ensure(str(bulk), index_file)
+    assert again is not None and again.index_file == mapped.index_file
+    again.close()
+
+    # A new bulk file gets a new index; the open one keeps working
+    bulk.write_bytes(gzip.compress(json.dumps(CARDS[:1]).encode("utf-8")))
+    later = os.path.getmtime(bulk) + 10
+    os.utime(bulk, (later, later))
+    rebuilt = MappedCardIndex.ensure(str(bulk), index_file)
+    assert rebuilt is not None
+    assert rebuilt.index_file != mapped.index_file
+    assert len(rebuilt) == 1
+    assert mapped["Fire // Ice"] == CARDS[1]
+    assert sorted(os.listdir(tmp_path)) == sorted(["bulk.json.gz", "cards.idx.lock",
+                                                   os.path.basename(rebuilt.index_file)])
+    rebuilt.close()
+    mapped.close()
+
+
+def test_ensure_isolated(tmp_path):
+    bulk = tmp_path / "bulk.json.gz"
+    bulk.write_bytes(gzip.compress(json.dumps(CARDS).encode("utf-8")))
+    mapped = MappedCardIndex.ensure(str(bulk), str(tmp_path / "cards.idx"), isolated=True)
+    assert mapped is not None
+    assert mapped["Lightning Bolt"] == CARDS[0]
+    mapped.close()
@@ -0,0 +1,33 @@
+import multiprocessing
+import os
+
+from src.core.filelock import FileLock, atomic_write
+
+
+def _increment(path, times):
+    for _ in range(times):
+        with FileLock(path):
+            with open(path, encoding="ascii") as f:
+                value = int(f.read())
+            atomic_write(path, str(value + 1).encode("ascii"))
+
+
+def test_atomic_write_replaces_without_leftovers(tmp_path):
+    path = tmp_path / "data.bin"
+    atomic_write(str(path), b"old")
+    atomic_write(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["data.bin"]
+
+
+def test_lock_serializes_processes(tmp_path):
+    path = str(tmp_path / "counter")
+    atomic_write(path, b"0")
+    workers = [multiprocessing.Process(target=_increment, args=(path, 50)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+    with open(path, encoding="ascii") as f:
+        assert int(f.read()) == 200